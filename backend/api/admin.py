@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Dataset, Equipment, EmailVerification
+from .models import Dataset, Equipment, EmailVerification, IngestionJob, UploadSession, ColumnMapping
 
 
 @admin.register(EmailVerification)
@@ -20,4 +20,24 @@ class DatasetAdmin(admin.ModelAdmin):
 class EquipmentAdmin(admin.ModelAdmin):
     list_display = ['equipment_name', 'equipment_type', 'flowrate', 'pressure', 'temperature', 'dataset']
     list_filter = ['equipment_type', 'dataset']
-    search_fields = ['equipment_name']
\ No newline at end of file
+    search_fields = ['equipment_name']
+
+
+@admin.register(IngestionJob)
+class IngestionJobAdmin(admin.ModelAdmin):
+    list_display = ['file_name', 'user', 'status', 'phase', 'rows_processed', 'created_at']
+    list_filter = ['status', 'created_at']
+    search_fields = ['file_name', 'user__username']
+
+
+@admin.register(UploadSession)
+class UploadSessionAdmin(admin.ModelAdmin):
+    list_display = ['file_name', 'user', 'received_bytes', 'total_size', 'status', 'updated_at']
+    list_filter = ['status']
+    search_fields = ['file_name', 'user__username']
+
+
+@admin.register(ColumnMapping)
+class ColumnMappingAdmin(admin.ModelAdmin):
+    list_display = ['user', 'name_column', 'type_column', 'use_count', 'last_used_at']
+    search_fields = ['user__username', 'name_column']
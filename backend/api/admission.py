@@ -0,0 +1,65 @@
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Count, Sum
+from django.utils import timezone
+
+from .models import IngestionLease
+from .utils import upload_compression, upload_format
+
+
+class IngestionBusy(Exception):
+    def __init__(self, retry_after):
+        super().__init__('Ingestion budget exhausted')
+        self.retry_after = retry_after
+
+
+def estimate_ingest_cost(size, name, streaming=False):
+    # Rough peak memory for parsing an upload of this size: compressed CSVs
+    # expand first, and a streaming parse only ever holds one chunk's worth.
+    expanded = size
+    if upload_compression(name):
+        expanded *= settings.INGEST_COMPRESSION_RATIO_ESTIMATE
+    if streaming and upload_format(name) == 'csv':
+        expanded = min(expanded, settings.INGEST_STREAMING_THRESHOLD_BYTES)
+    return int(expanded * settings.INGEST_MEMORY_FACTOR)
+
+
+def admit_ingestion(cost):
+    now = timezone.now()
+    IngestionLease.objects.filter(expires_at__lt=now).delete()
+    
+    lease = IngestionLease.objects.create(
+        cost_bytes=cost,
+        expires_at=now + timedelta(seconds=settings.INGEST_LEASE_SECONDS),
+    )
+    
+    # Leases are granted in id order: ours only competes with those taken
+    # before it. A lone ingestion is always admitted, however large.
+    ahead = IngestionLease.objects.filter(id__lt=lease.id).aggregate(count=Count('id'), cost=Sum('cost_bytes'))
+    over_concurrency = ahead['count'] >= settings.INGEST_MAX_CONCURRENT
+    over_budget = ahead['count'] > 0 and (ahead['cost'] or 0) + cost > settings.INGEST_MEMORY_BUDGET_BYTES
+    
+    if over_concurrency or over_budget:
+        lease.delete()
+        raise IngestionBusy(settings.INGEST_RETRY_AFTER_SECONDS)
+    
+    return lease
+
+
+def release_ingestion(lease):
+    IngestionLease.objects.filter(pk=lease.pk).delete()
+
+
+@contextmanager
+def ingestion_slot(cost):
+    if not settings.INGEST_ADMISSION_CONTROL:
+        yield
+        return
+    
+    lease = admit_ingestion(cost)
+    try:
+        yield
+    finally:
+        release_ingestion(lease)
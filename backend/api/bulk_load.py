@@ -0,0 +1,109 @@
+import csv
+from io import StringIO
+
+import pandas as pd
+from django.conf import settings
+from django.db import connection, transaction
+
+from .models import Equipment
+
+
+EQUIPMENT_PARAMETER_FIELDS = ('flowrate', 'pressure', 'temperature')
+EQUIPMENT_LOAD_FIELDS = ('dataset', 'equipment_name', 'equipment_type', *EQUIPMENT_PARAMETER_FIELDS)
+
+
+def bulk_load_backend():
+    backend = settings.BULK_LOAD_BACKEND
+    if backend != 'auto':
+        return backend
+    if connection.vendor == 'postgresql':
+        return 'copy'
+    return 'executemany'
+
+
+def equipment_columns():
+    return [Equipment._meta.get_field(field).column for field in EQUIPMENT_LOAD_FIELDS]
+
+
+def column_values(series):
+    # A missing reading (NaN) is stored as NULL on every backend; sqlite3
+    # binds NaN as NULL by itself, but psycopg2 would store a float NaN.
+    return series.astype(object).where(series.notna(), None).tolist()
+
+
+def copy_equipment(frame):
+    # COPY FROM STDIN: rows are serialized once as CSV and streamed to the
+    # server, with no per-row model instances or INSERT statements. Strings
+    # are quoted so an empty name is not read back as NULL; a missing reading
+    # is written as "" and FORCE_NULL loads it as NULL, as the other backends do.
+    qn = connection.ops.quote_name
+    sql = 'COPY {} ({}) FROM STDIN WITH (FORMAT csv, FORCE_NULL ({}))'.format(
+        qn(Equipment._meta.db_table),
+        ', '.join(qn(column) for column in frame.columns),
+        ', '.join(qn(Equipment._meta.get_field(field).column) for field in EQUIPMENT_PARAMETER_FIELDS),
+    )
+    batch_size = settings.BULK_LOAD_BATCH_SIZE
+    
+    with transaction.atomic(), connection.cursor() as cursor:
+        for start in range(0, len(frame), batch_size):
+            buffer = StringIO()
+            frame.iloc[start:start + batch_size].to_csv(buffer, header=False, index=False, quoting=csv.QUOTE_NONNUMERIC)
+            buffer.seek(0)
+            cursor.copy_expert(sql, buffer)
+
+
+def executemany_equipment(frame):
+    qn = connection.ops.quote_name
+    sql = 'INSERT INTO {} ({}) VALUES ({})'.format(
+        qn(Equipment._meta.db_table),
+        ', '.join(qn(column) for column in frame.columns),
+        ', '.join(['%s'] * len(frame.columns)),
+    )
+    rows = list(zip(*(column_values(frame[column]) for column in frame.columns)))
+    batch_size = settings.BULK_LOAD_BATCH_SIZE
+    
+    with transaction.atomic(), connection.cursor() as cursor:
+        for start in range(0, len(rows), batch_size):
+            cursor.executemany(sql, rows[start:start + batch_size])
+
+
+def orm_equipment(frame):
+    Equipment.objects.bulk_create(
+        [
+            Equipment(
+                dataset_id=dataset_id,
+                equipment_name=name,
+                equipment_type=eq_type,
+                flowrate=flowrate,
+                pressure=pressure,
+                temperature=temperature,
+            )
+            for dataset_id, name, eq_type, flowrate, pressure, temperature in zip(*(column_values(frame[column]) for column in frame.columns))
+        ],
+        batch_size=settings.BULK_LOAD_BATCH_SIZE,
+    )
+
+
+BULK_LOADERS = {
+    'copy': copy_equipment,
+    'executemany': executemany_equipment,
+    'orm': orm_equipment,
+}
+
+
+def bulk_load_equipment(dataset_id, names, types, params):
+    # names/types/params come straight from extract_columns and
+    # parameter_arrays; nothing is materialized per row.
+    if len(names) == 0:
+        return
+    
+    values = [
+        [dataset_id] * len(names),
+        names,
+        types,
+        params['flowrate'],
+        params['pressure'],
+        params['temperature'],
+    ]
+    frame = pd.DataFrame(dict(zip(equipment_columns(), values)))
+    BULK_LOADERS[bulk_load_backend()](frame)
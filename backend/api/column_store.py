@@ -0,0 +1,114 @@
+import os
+import shutil
+import struct
+
+import numpy as np
+from django.conf import settings
+
+
+# Every numeric column of a dataset is kept as a float64 .npy file under
+# MEDIA_ROOT/columns/<dataset id>/, read back with memory-mapping. The header
+# has a fixed size so rows can be appended and the shape rewritten in place.
+NPY_MAGIC = b'\x93NUMPY\x01\x00'
+NPY_HEADER_SIZE = 128
+NPY_ITEM_SIZE = 8
+
+
+def npy_header(length):
+    header = "{'descr': '<f8', 'fortran_order': False, 'shape': (%d,), }" % length
+    header = header.ljust(NPY_HEADER_SIZE - len(NPY_MAGIC) - 2 - 1) + '\n'
+    return NPY_MAGIC + struct.pack('<H', len(header)) + header.encode('latin1')
+
+
+def column_store_dir(dataset_id):
+    return os.path.join('columns', str(dataset_id))
+
+
+def column_store_path(relative):
+    return os.path.join(settings.MEDIA_ROOT, relative)
+
+
+def column_length(path):
+    return (os.path.getsize(path) - NPY_HEADER_SIZE) // NPY_ITEM_SIZE
+
+
+def column_store_lengths(dataset):
+    lengths = {}
+    for relative in (dataset.column_store or {}).values():
+        path = column_store_path(relative)
+        if os.path.exists(path):
+            lengths[relative] = column_length(path)
+    return lengths
+
+
+def truncate_column_store(manifest, lengths):
+    # The files are not part of the database transaction: when it rolls back,
+    # each file goes back to its length from column_store_lengths and files
+    # created since are removed.
+    for relative in manifest.values():
+        path = column_store_path(relative)
+        if not os.path.exists(path):
+            continue
+        if relative not in lengths:
+            os.remove(path)
+            continue
+        with open(path, 'r+b') as f:
+            f.truncate(NPY_HEADER_SIZE + lengths[relative] * NPY_ITEM_SIZE)
+            f.seek(0)
+            f.write(npy_header(lengths[relative]))
+
+
+def append_column_store(dataset, numeric):
+    # numeric is {column: float64 array}, as produced by extract_columns. The
+    # caller saves dataset.column_store.
+    manifest = dict(dataset.column_store or {})
+    
+    for col, values in numeric.items():
+        relative = manifest.get(col)
+        if relative is None:
+            relative = os.path.join(column_store_dir(dataset.id), f'{len(manifest)}.npy')
+        path = column_store_path(relative)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        data = np.ascontiguousarray(values, dtype='<f8')
+        
+        # A column new to the manifest always starts an empty file, so files
+        # left behind under a reused dataset id are never extended.
+        if col not in manifest or not os.path.exists(path):
+            with open(path, 'wb') as f:
+                f.write(npy_header(0))
+        
+        with open(path, 'r+b') as f:
+            length = column_length(path)
+            f.seek(NPY_HEADER_SIZE + length * NPY_ITEM_SIZE)
+            f.write(data.tobytes())
+            f.seek(0)
+            f.write(npy_header(length + len(data)))
+        
+        manifest[col] = relative
+    
+    dataset.column_store = manifest
+
+
+def load_column(dataset, col):
+    relative = (dataset.column_store or {}).get(col)
+    if not relative:
+        return None
+    return np.load(column_store_path(relative), mmap_mode='r')
+
+
+def column_statistics(values):
+    finite = values[~np.isnan(values)]
+    if len(finite) == 0:
+        return {'count': 0, 'missing': int(len(values)), 'mean': None, 'std': None, 'min': None, 'max': None}
+    return {
+        'count': int(len(finite)),
+        'missing': int(len(values) - len(finite)),
+        'mean': float(finite.mean()),
+        'std': float(finite.std(ddof=1)) if len(finite) > 1 else None,
+        'min': float(finite.min()),
+        'max': float(finite.max()),
+    }
+
+
+def delete_column_store(dataset_id):
+    shutil.rmtree(column_store_path(column_store_dir(dataset_id)), ignore_errors=True)
@@ -0,0 +1,105 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from .admission import IngestionBusy, estimate_ingest_cost, ingestion_slot
+from .models import Dataset, IngestionJob, UploadSession
+from .utils import ingest_dataset, release_stored_file, discard_upload_session_file, delete_datasets
+
+
+def claim_next_job():
+    # The conditional UPDATE makes the claim safe with several workers even on
+    # SQLite, where SELECT ... FOR UPDATE is not available.
+    for job in IngestionJob.objects.filter(status='queued').order_by('created_at')[:10]:
+        now = timezone.now()
+        claimed = IngestionJob.objects.filter(pk=job.pk, status='queued').update(
+            status='running', phase='parsing', started_at=now, updated_at=now
+        )
+        if claimed:
+            job.refresh_from_db()
+            return job
+    return None
+
+
+def recover_stale_jobs():
+    cutoff = timezone.now() - timedelta(seconds=settings.INGEST_JOB_STALE_SECONDS)
+    stale_jobs = IngestionJob.objects.filter(status='running', updated_at__lt=cutoff)
+    
+    for job in stale_jobs:
+        if job.dataset_id:
+            delete_datasets(Dataset.objects.filter(pk=job.dataset_id))
+        finish_job(job, success=False, error='Worker stopped before the job finished')
+    
+    return len(stale_jobs)
+
+
+def purge_expired_upload_sessions():
+    cutoff = timezone.now() - timedelta(hours=settings.UPLOAD_SESSION_EXPIRY_HOURS)
+    expired = UploadSession.objects.filter(status='open', updated_at__lt=cutoff)
+    
+    for session in expired:
+        discard_upload_session_file(session)
+    
+    return expired.delete()[0]
+
+
+def requeue_job(job):
+    IngestionJob.objects.filter(pk=job.pk).update(
+        status='queued',
+        phase='queued',
+        started_at=None,
+        updated_at=timezone.now(),
+    )
+
+
+def finish_job(job, success, dataset=None, error=''):
+    now = timezone.now()
+    IngestionJob.objects.filter(pk=job.pk).update(
+        status='succeeded' if success else 'failed',
+        phase='done' if success else 'failed',
+        rows_processed=dataset.total_equipment if dataset else 0,
+        dataset=dataset,
+        error=error,
+        updated_at=now,
+        finished_at=now,
+    )
+
+
+def run_ingestion_job(job):
+    def progress(phase, rows_processed, dataset):
+        IngestionJob.objects.filter(pk=job.pk).update(
+            phase=phase,
+            rows_processed=rows_processed,
+            dataset=dataset,
+            updated_at=timezone.now(),
+        )
+    
+    streaming = job.file_size > settings.INGEST_STREAMING_THRESHOLD_BYTES
+    
+    try:
+        with ingestion_slot(estimate_ingest_cost(job.file_size, job.file_name, streaming)):
+            with job.file.open('rb') as data_file:
+                success, result, dataset = ingest_dataset(
+                    job.user,
+                    data_file,
+                    job.file_name,
+                    streaming=streaming,
+                    content_hash=job.content_hash or None,
+                    stored_name=job.file.name,
+                    progress=progress,
+                )
+    except IngestionBusy:
+        # Over budget: hand the job back to the queue for a later pass
+        requeue_job(job)
+        raise
+    except Exception as e:
+        success, result, dataset = False, f"Error processing file: {str(e)}", None
+    
+    if success:
+        finish_job(job, success=True, dataset=dataset)
+    else:
+        finish_job(job, success=False, error=result)
+        release_stored_file(job.file.name)
+    
+    return success
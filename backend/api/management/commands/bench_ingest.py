@@ -0,0 +1,97 @@
+import time
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+from django.core.management.base import BaseCommand, CommandError
+
+from api.utils import process_csv_file, smart_detect_columns
+
+
+def build_sample_csv(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    types = np.array(['Pump', 'Compressor', 'Valve', 'HeatExchanger', 'Reactor', 'Condenser'])
+    df = pd.DataFrame({
+        'Equipment Name': [f'EQ-{i:07d}' for i in range(rows)],
+        'Type': types[rng.integers(0, len(types), rows)],
+        'Flowrate': rng.normal(120, 25, rows).round(2),
+        'Pressure': rng.normal(6, 1.5, rows).round(2),
+        'Temperature': rng.normal(110, 30, rows).round(2),
+    })
+    buf = BytesIO()
+    df.to_csv(buf, index=False)
+    return buf.getvalue()
+
+
+def legacy_row_materialization(csv_file):
+    # Reference copy of the original per-row loop, kept for comparison only.
+    df = pd.read_csv(csv_file)
+    detected_cols = smart_detect_columns(df)
+    name_col = detected_cols['name_column']
+    type_col = detected_cols['type_column']
+    numeric_cols = detected_cols['numeric_columns']
+
+    equipment_list = []
+    for idx, row in df.iterrows():
+        equipment_data = {
+            'name': str(row[name_col]),
+            'type': str(row[type_col]) if type_col else 'Equipment',
+            'numeric_data': {}
+        }
+        for col in numeric_cols:
+            try:
+                equipment_data['numeric_data'][col] = float(pd.to_numeric(row[col], errors='coerce'))
+            except:
+                equipment_data['numeric_data'][col] = 0.0
+        equipment_list.append(equipment_data)
+
+    return equipment_list
+
+
+def parse_with_engine(csv_file, engine):
+    success, result = process_csv_file(csv_file, engine=engine)
+    if not success:
+        raise CommandError(result)
+    return result
+
+
+class Command(BaseCommand):
+    help = 'Benchmark CSV ingestion throughput (rows/second) for the row-based path and each parse engine'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=200000)
+        parser.add_argument('--repeat', type=int, default=3)
+        parser.add_argument('--skip-legacy', action='store_true', help='Only time the columnar path')
+        parser.add_argument('--engines', default='c,pyarrow,python', help='Comma-separated read_csv engines to time')
+
+    def _time(self, func, payload, repeat, **kwargs):
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func(BytesIO(payload), **kwargs)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best
+
+    def handle(self, *args, **options):
+        rows = options['rows']
+        repeat = options['repeat']
+        payload = build_sample_csv(rows)
+        self.stdout.write(f"Benchmarking {rows} rows ({len(payload) / 1e6:.1f} MB), best of {repeat}")
+
+        results = []
+        if not options['skip_legacy']:
+            results.append(('row-based (iterrows)', self._time(legacy_row_materialization, payload, repeat)))
+        for engine in options['engines'].split(','):
+            try:
+                results.append((f'columnar ({engine})', self._time(parse_with_engine, payload, repeat, engine=engine)))
+            except CommandError as e:
+                self.stdout.write(self.style.WARNING(f"  {engine} engine skipped: {e}"))
+
+        for label, elapsed in results:
+            self.stdout.write(f"  {label:<22} {elapsed:8.3f}s  {rows / elapsed:12,.0f} rows/s")
+
+        if len(results) > 1:
+            baseline = results[0]
+            for label, elapsed in results[1:]:
+                self.stdout.write(self.style.SUCCESS(f"{label} vs {baseline[0]}: {baseline[1] / elapsed:.1f}x"))
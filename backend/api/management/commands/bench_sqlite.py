@@ -0,0 +1,160 @@
+import logging
+import multiprocessing
+import os
+import tempfile
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+
+
+BENCH_USER_PREFIX = 'sqlite-bench-'
+
+# Workers are spawned processes, each with its own SQLite connection, so the
+# Django setup and every model import happen inside them (this module is
+# imported by the children before settings are configured).
+
+
+def setup_worker(media_root):
+    import django
+    django.setup()
+    # Failed requests are counted, not logged with a traceback each
+    logging.getLogger('django.request').setLevel(logging.CRITICAL)
+    from django.conf import settings
+    settings.MEDIA_ROOT = media_root
+
+
+def prepare_database(users):
+    from django.contrib.auth.models import User
+    from django.core.management import call_command
+
+    call_command('migrate', verbosity=0)
+    for index in range(users):
+        User.objects.create_user(f'{BENCH_USER_PREFIX}{index}')
+
+
+def upload_once(client, payload):
+    from django.core.files.uploadedfile import SimpleUploadedFile
+
+    return client.post('/api/upload/', {'file': SimpleUploadedFile('bench.csv', payload, 'text/csv')}, format='multipart')
+
+
+def read_once(client):
+    # Dashboard load: dataset list, then the summary of the latest dataset
+    response = client.get('/api/datasets/')
+    if response.status_code == 200 and response.data:
+        response = client.get(f"/api/datasets/{response.data[0]['id']}/summary/")
+    return response
+
+
+def run_worker(role, index, owner, seconds, rows):
+    from django.contrib.auth.models import User
+    from django.db import OperationalError, connection
+    from rest_framework.test import APIClient
+
+    from api.management.commands.bench_ingest import build_sample_csv
+
+    client = APIClient(SERVER_NAME='localhost')
+    client.force_authenticate(User.objects.get(username=f'{BENCH_USER_PREFIX}{owner}'))
+
+    result = {'role': role, 'latencies': [], 'locked': 0, 'busy': 0, 'failed': 0}
+    deadline = time.perf_counter() + seconds
+    sequence = 0
+    while time.perf_counter() < deadline:
+        if role == 'upload':
+            # Distinct content every time, so no upload is deduplicated
+            payload = build_sample_csv(rows, seed=index * 1000000 + sequence)
+            sequence += 1
+
+        start = time.perf_counter()
+        try:
+            response = upload_once(client, payload) if role == 'upload' else read_once(client)
+        except OperationalError as e:
+            if 'locked' not in str(e):
+                raise
+            result['locked'] += 1
+            continue
+        finally:
+            connection.close_if_unusable_or_obsolete()
+
+        if response.status_code == 503:
+            result['busy'] += 1
+        elif response.status_code >= 400 and response.status_code != 404:
+            result['failed'] += 1
+        else:
+            result['latencies'].append(time.perf_counter() - start)
+
+    connection.close()
+    return result
+
+
+class Command(BaseCommand):
+    help = 'Benchmark concurrent upload + read throughput on SQLite with and without the SQLITE_TUNING connection profile'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--writers', type=int, default=4, help='Processes uploading CSVs through POST /api/upload/')
+        parser.add_argument('--readers', type=int, default=8, help='Processes loading the dataset list and a summary')
+        parser.add_argument('--seconds', type=float, default=20)
+        parser.add_argument('--rows', type=int, default=5000, help='Rows per uploaded CSV')
+        parser.add_argument('--profiles', default='off,on', help='Comma-separated SQLITE_TUNING settings to run')
+
+    def run_profile(self, tuned, options):
+        writers, readers = options['writers'], options['readers']
+        with tempfile.TemporaryDirectory() as workdir:
+            overrides = {
+                'DATABASE_URL': 'sqlite:///' + os.path.join(workdir, 'bench.sqlite3'),
+                'SQLITE_TUNING': str(tuned),
+                'DATASET_PURGE_THREAD': 'False',
+            }
+            saved = {key: os.environ.get(key) for key in overrides}
+            os.environ.update(overrides)
+            try:
+                context = multiprocessing.get_context('spawn')
+                with context.Pool(writers + readers, initializer=setup_worker, initargs=(os.path.join(workdir, 'media'),)) as pool:
+                    pool.apply(prepare_database, (max(writers, 1),))
+                    jobs = [('upload', i, i) for i in range(writers)]
+                    jobs += [('read', writers + i, i % max(writers, 1)) for i in range(readers)]
+                    return pool.starmap(run_worker, [(*job, options['seconds'], options['rows']) for job in jobs])
+            finally:
+                for key, value in saved.items():
+                    if value is None:
+                        os.environ.pop(key, None)
+                    else:
+                        os.environ[key] = value
+
+    def summarize(self, label, results, seconds):
+        totals = {}
+        for role in ('upload', 'read'):
+            role_results = [r for r in results if r['role'] == role]
+            if not role_results:
+                continue
+            latencies = np.array([value for r in role_results for value in r['latencies']]) * 1000
+            locked = sum(r['locked'] for r in role_results)
+            busy = sum(r['busy'] for r in role_results)
+            failed = sum(r['failed'] for r in role_results)
+            p50, p95 = np.percentile(latencies, [50, 95]) if len(latencies) else (float('nan'), float('nan'))
+            totals[role] = len(latencies) / seconds
+            self.stdout.write(
+                f"  {label:<4} {role:<7} {len(latencies):6d} ok {totals[role]:8.1f}/s  "
+                f"p50 {p50:7.1f}ms  p95 {p95:7.1f}ms  locked {locked:4d}  busy {busy:4d}  failed {failed:4d}"
+            )
+        return totals
+
+    def handle(self, *args, **options):
+        profiles = [profile.strip() for profile in options['profiles'].split(',') if profile.strip()]
+        if any(profile not in ('off', 'on') for profile in profiles):
+            raise CommandError('--profiles takes off and/or on')
+
+        self.stdout.write(
+            f"{options['writers']} upload + {options['readers']} read processes for {options['seconds']:.0f}s, "
+            f"{options['rows']:,} rows per upload, fresh SQLite database per profile"
+        )
+        throughput = {}
+        for profile in profiles:
+            results = self.run_profile(profile == 'on', options)
+            throughput[profile] = self.summarize(profile, results, options['seconds'])
+
+        if len(throughput) == 2:
+            for role, rate in throughput['off'].items():
+                if rate:
+                    self.stdout.write(self.style.SUCCESS(f"{role}: {throughput['on'][role] / rate:.1f}x with SQLITE_TUNING"))
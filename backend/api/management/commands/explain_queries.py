@@ -0,0 +1,102 @@
+import time
+
+import numpy as np
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count, Max, Min, StdDev
+
+from api.bulk_load import bulk_load_equipment
+from api.models import Dataset, Equipment
+from api.partitioning import equipment_partitioned, partition_name
+
+
+SEED_USER_PREFIX = 'explain-seed-'
+SEED_TYPES = np.array(['Pump', 'Compressor', 'Valve', 'HeatExchanger', 'Reactor', 'Condenser'], dtype=object)
+
+
+def api_queries(user, dataset, equipment_index, keyset_index):
+    # The same querysets the API views build, paired with the index (or any
+    # of the indexes) each one is expected to use.
+    return [
+        ('dataset list', 'dataset_owner_recent_idx', Dataset.objects.filter(uploaded_by=user)[:5]),
+        ('dataset retention', 'dataset_owner_recent_idx', Dataset.objects.filter(uploaded_by=user).order_by('-uploaded_at')),
+        ('type distribution', equipment_index, dataset.equipment.values('equipment_type').annotate(count=Count('id'))),
+        # Either dataset-leading index serves a whole-dataset scan
+        ('summary statistics', (equipment_index, keyset_index), dataset.equipment.values('dataset').annotate(
+            max_flowrate=Max('flowrate'), min_flowrate=Min('flowrate'), std_flowrate=StdDev('flowrate'),
+        )),
+        ('equipment page', keyset_index, dataset.equipment.filter(id__gt=0).order_by('id')[:1000]),
+    ]
+
+
+def seed_equipment(rows, datasets, users, stdout):
+    rng = np.random.default_rng(0)
+    seed_users = [User.objects.get_or_create(username=f'{SEED_USER_PREFIX}{i}')[0] for i in range(users)]
+    per_dataset = max(1, rows // datasets)
+
+    start = time.perf_counter()
+    for index in range(datasets):
+        dataset = Dataset.objects.create(name=f'seed-{index}.csv', uploaded_by=seed_users[index % users], total_equipment=per_dataset)
+        names = np.array([f'EQ-{i:07d}' for i in range(per_dataset)], dtype=object)
+        types = SEED_TYPES[rng.integers(0, len(SEED_TYPES), per_dataset)]
+        params = {field: rng.normal(100, 20, per_dataset) for field in ('flowrate', 'pressure', 'temperature')}
+        bulk_load_equipment(dataset.id, names, types, params)
+        if (index + 1) % max(1, datasets // 10) == 0:
+            stdout.write(f'  seeded {(index + 1) * per_dataset:,} rows ({time.perf_counter() - start:.0f}s)')
+
+    # Fresh planner statistics, as after autovacuum/ANALYZE in production
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+
+
+def remove_seed_data():
+    seed_users = User.objects.filter(username__startswith=SEED_USER_PREFIX)
+    Equipment.objects.filter(dataset__uploaded_by__in=seed_users).delete()
+    seed_users.delete()
+
+
+class Command(BaseCommand):
+    help = 'Print query plans (EXPLAIN) for the API dataset/equipment queries and check the composite indexes are used'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed-rows', type=int, default=0, help='Insert this many synthetic Equipment rows first (e.g. 10000000)')
+        parser.add_argument('--seed-datasets', type=int, default=1000)
+        parser.add_argument('--seed-users', type=int, default=50)
+        parser.add_argument('--cleanup', action='store_true', help='Remove the synthetic users and their data afterwards')
+
+    def handle(self, *args, **options):
+        if options['seed_rows']:
+            self.stdout.write(f"Seeding {options['seed_rows']:,} equipment rows on {connection.vendor}")
+            seed_equipment(options['seed_rows'], options['seed_datasets'], options['seed_users'], self.stdout)
+
+        dataset = Dataset.objects.filter(storage_mode='rows').order_by('-total_equipment').select_related('uploaded_by').first()
+        if dataset is None:
+            raise CommandError('No datasets to explain against; pass --seed-rows')
+
+        self.stdout.write(f'{Equipment.objects.count():,} equipment rows, {Dataset.objects.count():,} datasets ({connection.vendor})')
+
+        # Partition indexes get generated names; what matters there is that
+        # the plan is pruned to the dataset's own partition.
+        if equipment_partitioned():
+            equipment_index = keyset_index = partition_name(dataset.id)
+        else:
+            equipment_index, keyset_index = 'equipment_dataset_type_idx', 'equipment_dataset_id_idx'
+
+        missing = []
+        try:
+            for label, index_names, queryset in api_queries(dataset.uploaded_by, dataset, equipment_index, keyset_index):
+                index_names = index_names if isinstance(index_names, tuple) else (index_names,)
+                plan = queryset.explain()
+                used = any(name in plan for name in index_names)
+                style = self.style.SUCCESS if used else self.style.ERROR
+                self.stdout.write(style(f"\n{label}: {'uses' if used else 'does NOT use'} {' or '.join(dict.fromkeys(index_names))}"))
+                self.stdout.write(plan)
+                if not used:
+                    missing.append(label)
+        finally:
+            if options['cleanup']:
+                remove_seed_data()
+
+        if missing:
+            raise CommandError(f"Expected index not used for: {', '.join(missing)}")
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from api.partitioning import equipment_partitioned, partition_equipment_table, unpartition_equipment_table
+
+
+class Command(BaseCommand):
+    help = 'Convert api_equipment to a table LIST-partitioned by dataset (PostgreSQL only), or back with --undo'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--undo', action='store_true', help='Return to a single unpartitioned table')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError(f'Equipment partitioning needs PostgreSQL, not {connection.vendor}')
+
+        # The table is locked and rewritten in one transaction
+        with transaction.atomic():
+            if options['undo']:
+                changed = unpartition_equipment_table()
+            else:
+                changed = partition_equipment_table()
+
+        state = 'partitioned by dataset' if equipment_partitioned() else 'a single table'
+        if changed:
+            self.stdout.write(self.style.SUCCESS(f'api_equipment is now {state}'))
+        else:
+            self.stdout.write(f'api_equipment is already {state}')
@@ -0,0 +1,54 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from api.admission import IngestionBusy
+from api.jobs import claim_next_job, purge_expired_upload_sessions, recover_stale_jobs, run_ingestion_job
+from api.utils import purge_deleted_datasets
+
+
+class Command(BaseCommand):
+    help = 'Process queued background ingestion jobs from the IngestionJob table'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Exit when the queue is empty')
+        parser.add_argument('--poll-interval', type=float, default=settings.INGEST_WORKER_POLL_SECONDS)
+
+    def handle(self, *args, **options):
+        self.stdout.write('Ingestion worker started')
+
+        while True:
+            close_old_connections()
+
+            purge_expired_upload_sessions()
+            purged = purge_deleted_datasets()
+            if purged:
+                self.stdout.write(f'Purged {purged} deleted dataset(s)')
+            recovered = recover_stale_jobs()
+            if recovered:
+                self.stdout.write(self.style.WARNING(f'Marked {recovered} stale job(s) as failed'))
+
+            job = claim_next_job()
+            if job is None:
+                if options['once']:
+                    break
+                time.sleep(options['poll_interval'])
+                continue
+
+            self.stdout.write(f'Processing job {job.id}: {job.file_name}')
+            try:
+                succeeded = run_ingestion_job(job)
+            except IngestionBusy as e:
+                self.stdout.write(self.style.WARNING(f'Ingestion budget exhausted, job {job.id} requeued'))
+                if options['once']:
+                    break
+                time.sleep(e.retry_after)
+                continue
+
+            if succeeded:
+                self.stdout.write(self.style.SUCCESS(f'Job {job.id} finished'))
+            else:
+                job.refresh_from_db()
+                self.stdout.write(self.style.ERROR(f'Job {job.id} failed: {job.error}'))
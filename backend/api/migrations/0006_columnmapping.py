@@ -0,0 +1,35 @@
+# Generated by Django 4.2.16 on 2026-10-18 04:50
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('api', '0005_uploadsession'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ColumnMapping',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('header_hash', models.CharField(max_length=64)),
+                ('header', models.JSONField(default=list)),
+                ('name_column', models.CharField(max_length=255)),
+                ('type_column', models.CharField(blank=True, max_length=255, null=True)),
+                ('numeric_columns', models.JSONField(default=list)),
+                ('use_count', models.IntegerField(default=0)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('last_used_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='column_mappings', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('user', 'header_hash')},
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.16 on 2026-10-18 04:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0007_ingestionlease'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dataset',
+            name='accumulators',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.16 on 2026-10-18 05:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0008_dataset_accumulators'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dataset',
+            name='column_store',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
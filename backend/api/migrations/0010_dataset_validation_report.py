@@ -0,0 +1,18 @@
+# Generated by Django 4.2.16 on 2026-10-18 05:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0009_dataset_column_store'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dataset',
+            name='validation_report',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.2.16 on 2026-10-18 05:14
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0011_access_pattern_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DatasetStatistics',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('equipment_count', models.IntegerField(default=0)),
+                ('parameters', models.JSONField(default=dict)),
+                ('type_distribution', models.JSONField(default=dict)),
+                ('computed_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('dataset', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='statistics', to='api.dataset')),
+            ],
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 4.2.16 on 2026-10-18 05:17
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0012_datasetstatistics'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dataset',
+            name='storage_mode',
+            field=models.CharField(choices=[('rows', 'One Equipment row per record'), ('packed', 'Compressed arrays in PackedEquipmentBlock')], default='rows', max_length=10),
+        ),
+        migrations.CreateModel(
+            name='PackedEquipmentBlock',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('index', models.IntegerField()),
+                ('row_count', models.IntegerField()),
+                ('types', models.JSONField(default=list)),
+                ('names', models.BinaryField()),
+                ('type_codes', models.BinaryField()),
+                ('flowrate', models.BinaryField()),
+                ('pressure', models.BinaryField()),
+                ('temperature', models.BinaryField()),
+                ('dataset', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='packed_blocks', to='api.dataset')),
+            ],
+            options={
+                'ordering': ['index'],
+                'unique_together': {('dataset', 'index')},
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.16 on 2026-10-18 05:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0013_packed_storage'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dataset',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+    ]
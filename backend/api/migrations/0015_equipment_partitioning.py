@@ -0,0 +1,27 @@
+from django.conf import settings
+from django.db import migrations
+
+
+def partition_equipment(apps, schema_editor):
+    if not settings.EQUIPMENT_PARTITIONING:
+        return
+    from api.partitioning import model_indexes, partition_equipment_table
+    partition_equipment_table(schema_editor.connection, model_indexes(apps.get_model('api', 'Equipment')))
+
+
+def unpartition_equipment(apps, schema_editor):
+    from api.partitioning import model_indexes, unpartition_equipment_table
+    unpartition_equipment_table(schema_editor.connection, model_indexes(apps.get_model('api', 'Equipment')))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0014_dataset_deleted_at'),
+    ]
+
+    operations = [
+        # Only acts on PostgreSQL with EQUIPMENT_PARTITIONING=True; the model
+        # state is unchanged either way.
+        migrations.RunPython(partition_equipment, unpartition_equipment),
+    ]
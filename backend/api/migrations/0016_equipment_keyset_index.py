@@ -0,0 +1,17 @@
+# Generated by Django 4.2.16 on 2026-10-18 05:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0015_equipment_partitioning'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='equipment',
+            index=models.Index(fields=['dataset', 'id'], name='equipment_dataset_id_idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.16 on 2026-10-18 05:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0016_equipment_keyset_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='equipment',
+            name='flowrate',
+            field=models.FloatField(null=True),
+        ),
+        migrations.AlterField(
+            model_name='equipment',
+            name='pressure',
+            field=models.FloatField(null=True),
+        ),
+        migrations.AlterField(
+            model_name='equipment',
+            name='temperature',
+            field=models.FloatField(null=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.16 on 2026-10-18 06:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0017_equipment_nullable_parameters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='datasetstatistics',
+            name='quartiles_stale',
+            field=models.BooleanField(default=False),
+        ),
+    ]
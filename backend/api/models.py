@@ -12,31 +12,199 @@ class EmailVerification(models.Model):
         return f"{self.user.username} - {'Verified' if self.is_verified else 'Pending'}"
 
 
+class LiveDatasetManager(models.Manager):
+    # Hides datasets that are deleted but not yet purged (see
+    # api.utils.purge_deleted_datasets)
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
+
 class Dataset(models.Model):
+    STORAGE_MODE_CHOICES = [
+        ('rows', 'One Equipment row per record'),
+        ('packed', 'Compressed arrays in PackedEquipmentBlock'),
+    ]
+    
     name = models.CharField(max_length=255)
-    uploaded_by = models.ForeignKey(User, on_delete=models.CASCADE)
+    uploaded_by = models.ForeignKey(User, on_delete=models.CASCADE, db_index=False)
     uploaded_at = models.DateTimeField(default=timezone.now)
     file_path = models.FileField(upload_to='uploads/')
+    content_hash = models.CharField(max_length=64, blank=True, default='', db_index=True)
+    parse_summary = models.JSONField(default=dict, blank=True)
+    # RunningStats state per numeric column, so appended rows update the
+    # statistics without rescanning existing equipment
+    accumulators = models.JSONField(default=dict, blank=True)
+    # {numeric column: .npy path under MEDIA_ROOT}, see api.column_store
+    column_store = models.JSONField(default=dict, blank=True)
+    # Per-column counts of missing, non-numeric and out-of-range cells, see
+    # api.utils.ValidationReport
+    validation_report = models.JSONField(default=dict, blank=True)
+    storage_mode = models.CharField(max_length=10, choices=STORAGE_MODE_CHOICES, default='rows')
+    # Set by retention and DELETE; rows and files are removed in the background
+    deleted_at = models.DateTimeField(null=True, blank=True, db_index=True)
     
     total_equipment = models.IntegerField(default=0)
     avg_flowrate = models.FloatField(default=0.0)
     avg_pressure = models.FloatField(default=0.0)
     avg_temperature = models.FloatField(default=0.0)
     
+    objects = LiveDatasetManager()
+    all_objects = models.Manager()
+    
     class Meta:
         ordering = ['-uploaded_at']
+        indexes = [
+            # Every dataset listing filters by owner, newest first; also covers
+            # lookups by uploaded_by alone, so that FK has no index of its own
+            models.Index(fields=['uploaded_by', '-uploaded_at'], name='dataset_owner_recent_idx'),
+        ]
     
     def __str__(self):
         return f"{self.name} - {self.uploaded_at.strftime('%Y-%m-%d %H:%M')}"
 
 
+class DatasetStatistics(models.Model):
+    # Written at ingestion (and after appends) so the summary endpoint and PDF
+    # report read one row instead of aggregating over Equipment.
+    dataset = models.OneToOneField(Dataset, on_delete=models.CASCADE, related_name='statistics')
+    equipment_count = models.IntegerField(default=0)
+    # {flowrate|pressure|temperature: {count, min, max, mean, std, var, cv,
+    # q1, median, q3, iqr, whisker_low, whisker_high}}; std/var are population
+    # figures, as the StdDev()/Variance() aggregates they replace
+    parameters = models.JSONField(default=dict)
+    # Appends merge the moment figures in place; quartiles and whiskers need
+    # every value, so they are left out and recomputed when next read.
+    quartiles_stale = models.BooleanField(default=False)
+    type_distribution = models.JSONField(default=dict)
+    computed_at = models.DateTimeField(default=timezone.now)
+    
+    def __str__(self):
+        return f"Statistics for {self.dataset.name}"
+
+
+class PackedEquipmentBlock(models.Model):
+    # Equipment of a 'packed' dataset: up to PACKED_BLOCK_ROWS records per row,
+    # each field a zlib-compressed array (see api.packed_store).
+    dataset = models.ForeignKey(Dataset, on_delete=models.CASCADE, related_name='packed_blocks')
+    index = models.IntegerField()
+    row_count = models.IntegerField()
+    # Type vocabulary of the block; type_codes index into it
+    types = models.JSONField(default=list)
+    names = models.BinaryField()
+    type_codes = models.BinaryField()
+    flowrate = models.BinaryField()
+    pressure = models.BinaryField()
+    temperature = models.BinaryField()
+    
+    class Meta:
+        ordering = ['index']
+        unique_together = ('dataset', 'index')
+    
+    def __str__(self):
+        return f"{self.dataset.name} block {self.index} ({self.row_count} rows)"
+
+
 class Equipment(models.Model):
-    dataset = models.ForeignKey(Dataset, on_delete=models.CASCADE, related_name='equipment')
+    # dataset is the leading column of equipment_dataset_type_idx, which also
+    # serves plain lookups by dataset, so the FK needs no index of its own.
+    dataset = models.ForeignKey(Dataset, on_delete=models.CASCADE, related_name='equipment', db_index=False)
     equipment_name = models.CharField(max_length=255)
     equipment_type = models.CharField(max_length=100)
-    flowrate = models.FloatField()
-    pressure = models.FloatField()
-    temperature = models.FloatField()
+    # NULL for a reading the upload left blank or non-numeric
+    flowrate = models.FloatField(null=True)
+    pressure = models.FloatField(null=True)
+    temperature = models.FloatField(null=True)
+    
+    class Meta:
+        indexes = [
+            # Type distribution per dataset (GROUP BY equipment_type)
+            models.Index(fields=['dataset', 'equipment_type'], name='equipment_dataset_type_idx'),
+            # Keyset pagination of a dataset's rows (WHERE dataset_id = ? AND id > ? ORDER BY id)
+            models.Index(fields=['dataset', 'id'], name='equipment_dataset_id_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.equipment_name} ({self.equipment_type})"
+
+class IngestionJob(models.Model):
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('succeeded', 'Succeeded'),
+        ('failed', 'Failed'),
+    ]
+    
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='ingestion_jobs')
+    file = models.FileField(upload_to='jobs/')
+    file_name = models.CharField(max_length=255)
+    file_size = models.BigIntegerField(default=0)
+    content_hash = models.CharField(max_length=64, blank=True, default='')
+    
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued', db_index=True)
+    phase = models.CharField(max_length=20, default='queued')
+    rows_processed = models.BigIntegerField(default=0)
+    dataset = models.ForeignKey(Dataset, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    error = models.TextField(blank=True, default='')
+    
+    created_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(default=timezone.now)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['created_at']
+    
+    def __str__(self):
+        return f"{self.file_name} ({self.status})"
+
+
+class UploadSession(models.Model):
+    STATUS_CHOICES = [
+        ('open', 'Open'),
+        ('finalized', 'Finalized'),
+    ]
+    
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='upload_sessions')
+    file_name = models.CharField(max_length=255)
+    total_size = models.BigIntegerField()
+    received_bytes = models.BigIntegerField(default=0)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='open')
+    dataset = models.ForeignKey(Dataset, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    
+    created_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(default=timezone.now)
+    
+    def __str__(self):
+        return f"{self.file_name} ({self.received_bytes}/{self.total_size})"
+
+
+class ColumnMapping(models.Model):
+    # Column roles remembered per user for a normalized header, so files with a
+    # header seen before skip detection.
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='column_mappings')
+    header_hash = models.CharField(max_length=64)
+    header = models.JSONField(default=list)
+    name_column = models.CharField(max_length=255)
+    type_column = models.CharField(max_length=255, null=True, blank=True)
+    numeric_columns = models.JSONField(default=list)
+    
+    use_count = models.IntegerField(default=0)
+    created_at = models.DateTimeField(default=timezone.now)
+    last_used_at = models.DateTimeField(default=timezone.now)
+    
+    class Meta:
+        unique_together = ('user', 'header_hash')
+    
+    def __str__(self):
+        return f"{self.user.username} - {self.name_column} ({len(self.numeric_columns)} numeric)"
+
+
+class IngestionLease(models.Model):
+    # One row per ingestion currently holding part of the memory budget;
+    # expires_at reclaims leases left behind by a crashed process.
+    cost_bytes = models.BigIntegerField()
+    created_at = models.DateTimeField(default=timezone.now)
+    expires_at = models.DateTimeField(db_index=True)
     
     def __str__(self):
-        return f"{self.equipment_name} ({self.equipment_type})"
\ No newline at end of file
+        return f"Lease {self.id} ({self.cost_bytes} bytes)"
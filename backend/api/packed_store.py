@@ -0,0 +1,135 @@
+import zlib
+
+import numpy as np
+import pandas as pd
+from django.conf import settings
+
+from .models import Equipment, PackedEquipmentBlock
+
+
+# Datasets in 'packed' storage mode keep their equipment as compressed arrays
+# in PackedEquipmentBlock rows instead of one Equipment row per record. Names
+# are NUL-separated UTF-8, types are codes into a per-block vocabulary, and
+# parameters are little-endian float64.
+PACKED_PARAMETER_FIELDS = ('flowrate', 'pressure', 'temperature')
+NAME_SEPARATOR = '\x00'
+
+
+def equipment_storage_mode(row_count=None):
+    # row_count is None for streamed ingestion, where the size is only known
+    # at the end; streaming is only chosen for large uploads.
+    mode = settings.EQUIPMENT_STORAGE_MODE
+    if mode != 'auto':
+        return mode
+    if row_count is None or row_count >= settings.PACKED_STORAGE_MIN_ROWS:
+        return 'packed'
+    return 'rows'
+
+
+def type_code_dtype(vocabulary_size):
+    return np.min_scalar_type(max(vocabulary_size - 1, 0))
+
+
+def compress(data):
+    return zlib.compress(data, settings.PACKED_COMPRESSION_LEVEL)
+
+
+def pack_block(names, types, params):
+    codes, vocabulary = pd.factorize(pd.Series(types, dtype=object), use_na_sentinel=False)
+    block = {
+        'row_count': len(names),
+        'types': [str(value) for value in vocabulary],
+        'names': compress(NAME_SEPARATOR.join(map(str, names)).encode('utf-8')),
+        'type_codes': compress(codes.astype(type_code_dtype(len(vocabulary))).tobytes()),
+    }
+    for field in PACKED_PARAMETER_FIELDS:
+        block[field] = compress(np.ascontiguousarray(params[field], dtype='<f8').tobytes())
+    return block
+
+
+def append_packed_equipment(dataset, names, types, params):
+    # Same inputs as bulk_load_equipment; rows are split into blocks of
+    # PACKED_BLOCK_ROWS so reading the first rows only inflates one block.
+    block_rows = settings.PACKED_BLOCK_ROWS
+    start_index = PackedEquipmentBlock.objects.filter(dataset=dataset).count()
+
+    blocks = []
+    for offset in range(0, len(names), block_rows):
+        window = slice(offset, offset + block_rows)
+        block = pack_block(names[window], types[window], {field: params[field][window] for field in PACKED_PARAMETER_FIELDS})
+        blocks.append(PackedEquipmentBlock(dataset=dataset, index=start_index + len(blocks), **block))
+    PackedEquipmentBlock.objects.bulk_create(blocks)
+
+
+def unpack_parameters(block):
+    return {
+        field: np.frombuffer(zlib.decompress(getattr(block, field)), dtype='<f8')
+        for field in PACKED_PARAMETER_FIELDS
+    }
+
+
+def unpack_block(block):
+    names = zlib.decompress(block.names).decode('utf-8').split(NAME_SEPARATOR)
+    codes = np.frombuffer(zlib.decompress(block.type_codes), dtype=type_code_dtype(len(block.types)))
+    types = np.asarray(block.types, dtype=object)[codes]
+    return names, types, unpack_parameters(block)
+
+
+def packed_parameter_arrays(dataset):
+    blocks = [unpack_parameters(block) for block in dataset.packed_blocks.only(*PACKED_PARAMETER_FIELDS)]
+    return {
+        field: np.concatenate([block[field] for block in blocks]) if blocks else np.zeros(0)
+        for field in PACKED_PARAMETER_FIELDS
+    }
+
+
+def block_equipment(dataset, block, start, stop, first_id):
+    # Unsaved Equipment instances, so callers can treat both storage modes
+    # alike. Packed rows have no primary key; their id is the 1-based position
+    # in the dataset. NaN readings come back as None, as row storage holds them.
+    names, types, params = unpack_block(block)
+    values = zip(*(np.where(np.isnan(params[field][start:stop]), None, params[field][start:stop]).tolist() for field in PACKED_PARAMETER_FIELDS))
+    return [
+        Equipment(
+            id=first_id + offset,
+            dataset=dataset,
+            equipment_name=name,
+            equipment_type=eq_type,
+            flowrate=flowrate,
+            pressure=pressure,
+            temperature=temperature,
+        )
+        for offset, (name, eq_type, (flowrate, pressure, temperature)) in enumerate(zip(names[start:stop], types[start:stop], values))
+    ]
+
+
+def packed_equipment(dataset, limit=None, after=0):
+    # Rows with id > after, reading only the blocks that hold them
+    equipment = []
+    position = 0
+    for index, row_count in dataset.packed_blocks.values_list('index', 'row_count'):
+        if limit is not None and len(equipment) >= limit:
+            break
+        if position + row_count > after:
+            start = max(after - position, 0)
+            stop = row_count if limit is None else min(row_count, start + limit - len(equipment))
+            block = dataset.packed_blocks.get(index=index)
+            equipment.extend(block_equipment(dataset, block, start, stop, position + start + 1))
+        position += row_count
+    return equipment
+
+
+def dataset_equipment(dataset, limit=None):
+    if dataset.storage_mode == 'packed':
+        return packed_equipment(dataset, limit)
+    # Insertion order; without order_by the plan may walk the (dataset, type) index
+    queryset = dataset.equipment.order_by('id')
+    return queryset[:limit] if limit is not None else queryset
+
+
+def dataset_equipment_page(dataset, after=0, limit=None):
+    # Keyset page: the rows with id greater than after, in id order
+    if dataset.storage_mode == 'packed':
+        return packed_equipment(dataset, limit, after)
+    queryset = dataset.equipment.filter(id__gt=after).order_by('id')
+    return list(queryset[:limit] if limit is not None else queryset)
@@ -0,0 +1,179 @@
+from django.db import connection, transaction
+
+from .models import Dataset, Equipment
+
+
+# Optional PostgreSQL layout: api_equipment LIST-partitioned by dataset_id, one
+# partition per dataset plus a DEFAULT partition for anything without its own.
+# A dataset's rows are then dropped with DROP TABLE on its partition instead of
+# a DELETE and the VACUUM that follows, and per-dataset scans read only that
+# partition. Enabled with EQUIPMENT_PARTITIONING at migrate time or with
+# `manage.py partition_equipment`; every function is a no-op elsewhere.
+#
+# PostgreSQL requires the partition key in the primary key, so the table's key
+# becomes (dataset_id, id); id is still unique, drawn from a plain sequence
+# because identity columns are not allowed on partitioned tables before 17.
+
+
+def equipment_table():
+    return Equipment._meta.db_table
+
+
+def partition_name(dataset_id):
+    return f'{equipment_table()}_p{int(dataset_id)}'
+
+
+def id_sequence_name():
+    return f'{equipment_table()}_id_partitioned_seq'
+
+
+def default_partition_name():
+    return f'{equipment_table()}_default'
+
+
+def equipment_partitioned(conn=None):
+    conn = conn or connection
+    if conn.vendor != 'postgresql':
+        return False
+    with conn.cursor() as cursor:
+        cursor.execute('SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s)', [equipment_table()])
+        return cursor.fetchone() is not None
+
+
+def create_partition_sql(qn, dataset_id):
+    return 'CREATE TABLE IF NOT EXISTS {} PARTITION OF {} FOR VALUES IN ({})'.format(
+        qn(partition_name(dataset_id)), qn(equipment_table()), int(dataset_id),
+    )
+
+
+def model_indexes(model):
+    # [(name, columns)] of the model's Meta.indexes. Migrations pass their
+    # historical Equipment, so later AddIndex migrations do not collide with
+    # indexes built here.
+    return [
+        (index.name, [model._meta.get_field(name).column for name in index.fields])
+        for index in model._meta.indexes
+    ]
+
+
+def add_equipment_constraints(cursor, qn, primary_key, indexes):
+    table = qn(equipment_table())
+    dataset_table = qn(Dataset._meta.db_table)
+
+    # Indexes are built after the rows are copied, which is faster than
+    # maintaining them during the load.
+    cursor.execute(f'ALTER TABLE {table} ADD PRIMARY KEY ({primary_key})')
+    cursor.execute(
+        f'ALTER TABLE {table} ADD CONSTRAINT {qn(equipment_table() + "_dataset_id_fk")} '
+        f'FOREIGN KEY ("dataset_id") REFERENCES {dataset_table} ("id") DEFERRABLE INITIALLY DEFERRED'
+    )
+    for name, columns in indexes:
+        cursor.execute(f"CREATE INDEX {qn(name)} ON {table} ({', '.join(qn(column) for column in columns)})")
+
+
+def partition_equipment_table(conn=None, indexes=None):
+    conn = conn or connection
+    indexes = model_indexes(Equipment) if indexes is None else indexes
+    if conn.vendor != 'postgresql' or equipment_partitioned(conn):
+        return False
+
+    qn = conn.ops.quote_name
+    table = qn(equipment_table())
+    old_table = qn(equipment_table() + '_unpartitioned')
+    sequence = qn(id_sequence_name())
+
+    with conn.cursor() as cursor:
+        cursor.execute(f'LOCK TABLE {table} IN ACCESS EXCLUSIVE MODE')
+        cursor.execute(f'ALTER TABLE {table} RENAME TO {old_table}')
+        cursor.execute(f'CREATE TABLE {table} (LIKE {old_table}) PARTITION BY LIST ("dataset_id")')
+        cursor.execute(f'CREATE SEQUENCE {sequence}')
+        cursor.execute(f"ALTER TABLE {table} ALTER COLUMN \"id\" SET DEFAULT nextval('{id_sequence_name()}')")
+
+        cursor.execute(
+            f'SELECT DISTINCT "dataset_id" FROM {old_table} UNION '
+            f'SELECT "id" FROM {qn(Dataset._meta.db_table)} WHERE "storage_mode" = %s',
+            ['rows'],
+        )
+        for (dataset_id,) in cursor.fetchall():
+            cursor.execute(create_partition_sql(qn, dataset_id))
+        cursor.execute(f'CREATE TABLE {qn(default_partition_name())} PARTITION OF {table} DEFAULT')
+
+        cursor.execute(f'INSERT INTO {table} SELECT * FROM {old_table}')
+        cursor.execute(f'SELECT setval(%s, COALESCE(MAX("id"), 0) + 1, false) FROM {table}', [id_sequence_name()])
+        cursor.execute(f'DROP TABLE {old_table}')
+        cursor.execute(f'ALTER SEQUENCE {sequence} OWNED BY {table}."id"')
+        add_equipment_constraints(cursor, qn, '"dataset_id", "id"', indexes)
+    return True
+
+
+def unpartition_equipment_table(conn=None, indexes=None):
+    conn = conn or connection
+    indexes = model_indexes(Equipment) if indexes is None else indexes
+    if not equipment_partitioned(conn):
+        return False
+
+    qn = conn.ops.quote_name
+    table = qn(equipment_table())
+    old_table = qn(equipment_table() + '_partitioned')
+    sequence = qn(id_sequence_name())
+
+    with conn.cursor() as cursor:
+        cursor.execute(f'LOCK TABLE {table} IN ACCESS EXCLUSIVE MODE')
+        cursor.execute(f'ALTER SEQUENCE {sequence} OWNED BY NONE')
+        cursor.execute(f'ALTER TABLE {table} RENAME TO {old_table}')
+        cursor.execute(f'CREATE TABLE {table} (LIKE {old_table} INCLUDING DEFAULTS)')
+        cursor.execute(f'INSERT INTO {table} SELECT * FROM {old_table}')
+        cursor.execute(f'DROP TABLE {old_table}')
+        cursor.execute(f'ALTER SEQUENCE {sequence} OWNED BY {table}."id"')
+        add_equipment_constraints(cursor, qn, '"id"', indexes)
+    return True
+
+
+def partition_exists(dataset_id):
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT to_regclass(%s) IS NOT NULL', [partition_name(dataset_id)])
+        return cursor.fetchone()[0]
+
+
+def create_dataset_partition(dataset_id):
+    # CREATE TABLE ... PARTITION OF takes an ACCESS EXCLUSIVE lock on
+    # api_equipment; building the table on its own and attaching it needs only
+    # SHARE UPDATE EXCLUSIVE. Rows the dataset already has in the DEFAULT
+    # partition (written before its partition existed) would make the attach
+    # fail, so they are moved across first.
+    if not equipment_partitioned() or partition_exists(dataset_id):
+        return
+    qn = connection.ops.quote_name
+    table = qn(equipment_table())
+    partition = qn(partition_name(dataset_id))
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f'CREATE TABLE {partition} (LIKE {table} INCLUDING DEFAULTS)')
+        cursor.execute(
+            f'WITH moved AS (DELETE FROM {qn(default_partition_name())} WHERE "dataset_id" = %s RETURNING *) '
+            f'INSERT INTO {partition} SELECT * FROM moved',
+            [int(dataset_id)],
+        )
+        cursor.execute(f'ALTER TABLE {table} ATTACH PARTITION {partition} FOR VALUES IN ({int(dataset_id)})')
+
+
+def reserve_dataset_partition():
+    # For ingestion that creates a dataset and its rows in one transaction:
+    # takes the next Dataset id and attaches its partition in a transaction of
+    # its own beforehand, so the ingest transaction holds no lock on the
+    # partitioned table while it loads rows. None when not partitioned.
+    if not equipment_partitioned():
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT nextval(pg_get_serial_sequence(%s, 'id'))", [Dataset._meta.db_table])
+        dataset_id = cursor.fetchone()[0]
+    create_dataset_partition(dataset_id)
+    return dataset_id
+
+
+def drop_dataset_partitions(dataset_ids):
+    if not dataset_ids or not equipment_partitioned():
+        return
+    qn = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        for dataset_id in dataset_ids:
+            cursor.execute(f'DROP TABLE IF EXISTS {qn(partition_name(dataset_id))}')
@@ -1,6 +1,7 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
-from .models import Dataset, Equipment
+from .models import Dataset, Equipment, IngestionJob
+from .packed_store import dataset_equipment
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -17,7 +18,9 @@ class EquipmentSerializer(serializers.ModelSerializer):
 
 class DatasetSerializer(serializers.ModelSerializer):
     uploaded_by = UserSerializer(read_only=True)
-    equipment = EquipmentSerializer(many=True, read_only=True)
+    # Every row of the dataset, only with context['include_equipment'];
+    # clients page through /datasets/<id>/equipment/ instead
+    equipment = serializers.SerializerMethodField()
     
     class Meta:
         model = Dataset
@@ -26,6 +29,14 @@ class DatasetSerializer(serializers.ModelSerializer):
             'total_equipment', 'avg_flowrate', 'avg_pressure', 
             'avg_temperature', 'equipment'
         ]
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if not self.context.get('include_equipment'):
+            self.fields.pop('equipment')
+    
+    def get_equipment(self, dataset):
+        return EquipmentSerializer(dataset_equipment(dataset), many=True).data
 
 
 class DatasetListSerializer(serializers.ModelSerializer):
@@ -36,4 +47,15 @@ class DatasetListSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'name', 'uploaded_by', 'uploaded_at',
             'total_equipment', 'avg_flowrate', 'avg_pressure', 'avg_temperature'
-        ]
\ No newline at end of file
+        ]
+
+class IngestionJobSerializer(serializers.ModelSerializer):
+    dataset_id = serializers.IntegerField(read_only=True)
+    
+    class Meta:
+        model = IngestionJob
+        fields = [
+            'id', 'file_name', 'file_size', 'status', 'phase',
+            'rows_processed', 'dataset_id', 'error',
+            'created_at', 'started_at', 'finished_at'
+        ]
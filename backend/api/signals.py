@@ -0,0 +1,55 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .column_store import delete_column_store
+from .models import Dataset
+from .partitioning import create_dataset_partition, drop_dataset_partitions
+
+
+@receiver(post_delete, sender=Dataset)
+def remove_column_store(sender, instance, **kwargs):
+    # Also runs for datasets removed by cascade (account deletion)
+    delete_column_store(instance.id)
+    drop_dataset_partitions([instance.id])
+
+
+@receiver(post_save, sender=Dataset)
+def add_equipment_partition(sender, instance, created, **kwargs):
+    # Inside a transaction the attach waits for the commit, so the lock on the
+    # equipment table is not held while rows load; rows written meanwhile sit
+    # in the DEFAULT partition and are moved across by the attach.
+    if created and instance.storage_mode == 'rows':
+        if transaction.get_connection().in_atomic_block:
+            transaction.on_commit(lambda: create_dataset_partition(instance.id))
+        else:
+            create_dataset_partition(instance.id)
+
+
+def begin_immediate(execute, sql, params, many, context):
+    # Django opens SQLite transactions with a deferred BEGIN. One that reads
+    # before it writes (update_or_create) then fails with "database is locked"
+    # at once when another writer got in first, without waiting busy_timeout;
+    # IMMEDIATE takes the write lock up front (transaction_mode in Django 5.1+).
+    if sql == 'BEGIN':
+        sql = 'BEGIN IMMEDIATE'
+    return execute(sql, params, many, context)
+
+
+@receiver(connection_created)
+def tune_sqlite_connection(sender, connection, **kwargs):
+    if connection.vendor != 'sqlite' or not settings.SQLITE_TUNING:
+        return
+    if begin_immediate not in connection.execute_wrappers:
+        connection.execute_wrappers.append(begin_immediate)
+    with connection.cursor() as cursor:
+        # journal_mode is stored in the database file; in-memory databases
+        # (the test runner) cannot use WAL.
+        if not connection.is_in_memory_db():
+            cursor.execute('PRAGMA journal_mode=WAL')
+        cursor.execute('PRAGMA synchronous=NORMAL')
+        cursor.execute(f'PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}')
+        cursor.execute(f'PRAGMA cache_size=-{int(settings.SQLITE_CACHE_SIZE_KB)}')
+        cursor.execute(f'PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}')
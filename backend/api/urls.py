@@ -18,9 +18,19 @@ urlpatterns = [
     
     # Dataset operations
     path('upload/', views.upload_dataset, name='upload_dataset'),
+    path('upload/batch/', views.upload_batch, name='upload_batch'),
+    path('uploads/', views.create_upload_session, name='create_upload_session'),
+    path('uploads/<int:upload_id>/', views.upload_session_detail, name='upload_session_detail'),
+    path('uploads/<int:upload_id>/finalize/', views.finalize_upload_session, name='finalize_upload_session'),
     path('datasets/', views.list_datasets, name='list_datasets'),
     path('datasets/<int:dataset_id>/', views.dataset_detail, name='dataset_detail'),
     path('datasets/<int:dataset_id>/summary/', views.dataset_summary, name='dataset_summary'),
     path('datasets/<int:dataset_id>/report/', views.generate_report, name='generate_report'),
+    path('datasets/<int:dataset_id>/columns/', views.dataset_columns, name='dataset_columns'),
+    path('datasets/<int:dataset_id>/equipment/', views.dataset_equipment_list, name='dataset_equipment'),
+    path('datasets/<int:dataset_id>/append/', views.append_dataset, name='append_dataset'),
     path('datasets/<int:dataset_id>/delete/', views.delete_dataset, name='delete_dataset'),
+    
+    # Background ingestion
+    path('jobs/<int:job_id>/', views.job_status, name='job_status'),
 ]
\ No newline at end of file
@@ -3,7 +3,7 @@ import numpy as np
 import matplotlib
 matplotlib.use('Agg')
 import matplotlib.pyplot as plt
-from io import BytesIO
+from io import BytesIO, BufferedReader, RawIOBase, UnsupportedOperation
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.lib import colors
 from reportlab.lib.units import inch
@@ -11,20 +11,62 @@ from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph,
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT, TA_JUSTIFY
 from reportlab.pdfgen import canvas
-from django.core.files.base import ContentFile
-from .models import Equipment
-from django.db import models
+from django.core.files.base import ContentFile, File
+from django.core.files.storage import default_storage
+from django.conf import settings
+from .models import Dataset, DatasetStatistics, Equipment, IngestionJob, ColumnMapping
+from .bulk_load import bulk_load_equipment
+from .column_store import append_column_store, column_store_lengths, load_column, truncate_column_store
+from .partitioning import drop_dataset_partitions, reserve_dataset_partition
+from .packed_store import append_packed_equipment, dataset_equipment, equipment_storage_mode, packed_parameter_arrays
+from django.db import connection, models, transaction
+from django.utils import timezone
 from datetime import datetime
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+import django
+import bz2
+import copy
+import gzip
+import hashlib
+import lzma
+import os
+import threading
+import uuid
+import zipfile
 
 
-def smart_detect_columns(df):
+TYPE_COLUMN_UNIQUE_RATIO = 0.5
+# Sampled unique ratios inside this band are too close to call and fall back
+# to a full-column nunique().
+TYPE_COLUMN_AMBIGUOUS_BAND = (0.25, 0.75)
+
+
+COLUMN_NAME_PATTERNS = {
+    'name': ['name', 'equipment', 'item', 'machine', 'device', 'unit'],
+    'type': ['type', 'category', 'class', 'kind', 'classification'],
+    'numeric': ['flow', 'rate', 'pressure', 'temp', 'temperature', 'value', 'reading']
+}
+
+
+def detection_sample(df, sample_size):
+    if not sample_size or len(df) <= 2 * sample_size:
+        return df
+    
+    head = df.iloc[:sample_size]
+    tail = df.iloc[sample_size:].sample(n=sample_size, random_state=0)
+    return pd.concat([head, tail])
+
+
+def smart_detect_columns(df, sample_size=None):
     columns = df.columns.tolist()
     
-    patterns = {
-        'name': ['name', 'equipment', 'item', 'machine', 'device', 'unit'],
-        'type': ['type', 'category', 'class', 'kind', 'classification'],
-        'numeric': ['flow', 'rate', 'pressure', 'temp', 'temperature', 'value', 'reading']
-    }
+    if sample_size is None:
+        sample_size = settings.COLUMN_DETECTION_SAMPLE_SIZE
+    sample = detection_sample(df, sample_size)
+    sampled = len(sample) < len(df)
+    
+    patterns = COLUMN_NAME_PATTERNS
     
     detected = {
         'name_column': None,
@@ -50,7 +92,11 @@ def smart_detect_columns(df):
     if not detected['type_column']:
         for col in columns:
             if col != detected['name_column'] and df[col].dtype == 'object':
-                if df[col].nunique() < len(df) * 0.5:
+                unique_ratio = sample[col].nunique() / len(sample)
+                low, high = TYPE_COLUMN_AMBIGUOUS_BAND
+                if sampled and low <= unique_ratio <= high:
+                    unique_ratio = df[col].nunique() / len(df)
+                if unique_ratio < TYPE_COLUMN_UNIQUE_RATIO:
                     detected['type_column'] = col
                     break
     
@@ -59,8 +105,15 @@ def smart_detect_columns(df):
     
     for col in columns:
         if col not in [detected['name_column'], detected['type_column']]:
+            if pd.api.types.is_numeric_dtype(df[col]):
+                detected['numeric_columns'].append(col)
+                continue
             try:
-                pd.to_numeric(df[col], errors='raise')
+                pd.to_numeric(sample[col], errors='raise')
+                # The sample parsed cleanly, but unsampled rows of an object
+                # column may not; only then is the full column checked.
+                if sampled:
+                    pd.to_numeric(df[col], errors='raise')
                 detected['numeric_columns'].append(col)
             except (ValueError, TypeError):
                 pass
@@ -68,150 +121,1384 @@ def smart_detect_columns(df):
     return detected
 
 
-def process_csv_file(csv_file):
+EQUIPMENT_PARAMETER_FIELDS = ('flowrate', 'pressure', 'temperature')
+
+
+class RunningStats:
+    # Chunked Welford accumulator: each update() merges a whole array into the
+    # running count/mean/M2 using the parallel form of the recurrence.
+    def __init__(self):
+        self.count = 0
+        self.mean = float('nan')
+        self.m2 = 0.0
+        self.min = float('nan')
+        self.max = float('nan')
+    
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        n = len(values)
+        if n == 0:
+            return
+        
+        chunk_mean = float(values.mean())
+        chunk_m2 = float(np.square(values - chunk_mean).sum())
+        chunk_min = float(values.min())
+        chunk_max = float(values.max())
+        
+        if self.count == 0:
+            self.count, self.mean, self.m2 = n, chunk_mean, chunk_m2
+            self.min, self.max = chunk_min, chunk_max
+            return
+        
+        total = self.count + n
+        delta = chunk_mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += chunk_m2 + delta * delta * self.count * n / total
+        self.count = total
+        self.min = min(self.min, chunk_min)
+        self.max = max(self.max, chunk_max)
+    
+    @property
+    def variance(self):
+        return self.m2 / (self.count - 1) if self.count > 1 else float('nan')
+    
+    @property
+    def std(self):
+        return float(np.sqrt(self.variance))
+    
+    def as_range(self):
+        return {
+            'min': self.min,
+            'max': self.max,
+            'std': self.std,
+        }
+    
+    def state(self):
+        return {'count': self.count, 'mean': self.mean, 'm2': self.m2, 'min': self.min, 'max': self.max}
+    
+    @classmethod
+    def from_state(cls, state):
+        # json_safe stores NaN as None
+        stats = cls()
+        for key, value in (state or {}).items():
+            setattr(stats, key, float('nan') if value is None else value)
+        stats.count = int(stats.count)
+        return stats
+
+
+class ValidationReport:
+    # Counts of missing, non-numeric and out-of-range cells per column, taken
+    # from whole-column masks over the parsed frame (no per-cell work). Sample
+    # row indices are 0-based data rows; offset places a chunk in the file.
+    def __init__(self):
+        self.rows_checked = 0
+        self.columns = {}
+    
+    def _column(self, col, checks):
+        entry = self.columns.setdefault(col, {})
+        for check in checks:
+            entry.setdefault(check, {'count': 0, 'rows': []})
+        return entry
+    
+    def _record(self, entry, mask, offset):
+        count = int(np.count_nonzero(mask))
+        if count == 0:
+            return
+        entry['count'] += count
+        room = settings.VALIDATION_SAMPLE_ROWS - len(entry['rows'])
+        if room > 0:
+            entry['rows'].extend((np.flatnonzero(mask)[:room] + offset).tolist())
+    
+    def check_numeric(self, col, raw, values, offset=0):
+        entry = self._column(col, ('missing', 'non_numeric', 'out_of_range'))
+        missing = raw.isna().to_numpy()
+        self._record(entry['missing'], missing, offset)
+        self._record(entry['non_numeric'], np.isnan(values) & ~missing, offset)
+        
+        out_of_range = np.isinf(values)
+        low, high = settings.VALIDATION_RANGES.get(str(col).strip().lower(), (None, None))
+        if low is not None:
+            out_of_range |= values < low
+        if high is not None:
+            out_of_range |= values > high
+        self._record(entry['out_of_range'], out_of_range, offset)
+    
+    def update(self, df, detected_cols, numeric, offset=0):
+        # numeric is extract_columns' {column: float64 array} for df
+        for col in (detected_cols['name_column'], detected_cols['type_column']):
+            if col:
+                self._record(self._column(col, ('missing',))['missing'], df[col].isna().to_numpy(), offset)
+        for col in detected_cols['numeric_columns']:
+            self.check_numeric(col, df[col], numeric[col], offset)
+        self.rows_checked = max(self.rows_checked, offset + len(df))
+    
+    def check_dropped(self, df, columns, offset=0):
+        # Columns that looked numeric but are not stored as numeric, because
+        # some of their values were not numbers (see rejected_numeric_columns).
+        for col in columns:
+            self.check_numeric(col, df[col], pd.to_numeric(df[col], errors='coerce').to_numpy(dtype=np.float64), offset)
+            self.columns[col]['dropped'] = True
+    
+    def state(self):
+        invalid = sum(
+            check['count'] for entry in self.columns.values()
+            for check in entry.values() if isinstance(check, dict)
+        )
+        return {'rows_checked': self.rows_checked, 'invalid_cells': invalid, 'columns': self.columns}
+    
+    @classmethod
+    def from_state(cls, state):
+        report = cls()
+        if state:
+            report.rows_checked = state['rows_checked']
+            report.columns = copy.deepcopy(state['columns'])
+        return report
+
+
+def extract_columns(df, detected_cols):
+    name_col = detected_cols['name_column']
+    type_col = detected_cols['type_column']
+    
+    numeric_data = {
+        col: pd.to_numeric(df[col], errors='coerce').to_numpy(dtype=np.float64)
+        for col in detected_cols['numeric_columns']
+    }
+    
+    return {
+        'name': df[name_col].astype(str).to_numpy(),
+        'type': df[type_col].astype(str).to_numpy() if type_col else np.full(len(df), 'Equipment', dtype=object),
+        'numeric': numeric_data,
+    }
+
+
+def build_column_summary(all_columns, detected_cols):
+    return {
+        'total_columns': len(all_columns),
+        'name_column': detected_cols['name_column'],
+        'type_column': detected_cols['type_column'],
+        'numeric_columns': detected_cols['numeric_columns'],
+        'all_columns': list(all_columns)
+    }
+
+
+def detection_error(detected_cols):
+    if not detected_cols['name_column']:
+        return "Could not detect equipment name column"
+    
+    if len(detected_cols['numeric_columns']) < 1:
+        return "No numeric data columns found. CSV must contain at least one numeric column."
+    
+    return None
+
+
+def normalize_header(columns):
+    return [str(col).strip().lower() for col in columns]
+
+
+def header_hash(columns):
+    return hashlib.sha256('\x1f'.join(normalize_header(columns)).encode('utf-8')).hexdigest()
+
+
+def resolve_column_mapping(columns, mapping):
+    by_normalized = dict(zip(normalize_header(columns), columns))
+    
+    def resolve(col):
+        return by_normalized.get(str(col).strip().lower()) if col else None
+    
+    detected = {
+        'name_column': resolve(mapping['name_column']),
+        'type_column': resolve(mapping['type_column']),
+        'numeric_columns': [resolve(col) for col in mapping['numeric_columns']],
+    }
+    if not detected['name_column'] or None in detected['numeric_columns']:
+        return None
+    if mapping['type_column'] and not detected['type_column']:
+        return None
+    return detected
+
+
+def detect_with_memo(sample, known_mappings, sample_size=None):
+    # known_mappings is {header_hash: mapping} for the uploading user; a hit
+    # skips smart_detect_columns entirely. The returned memo keeps a copy of
+    # the roles, since numeric columns may later be dropped for this file only.
+    digest = header_hash(sample.columns)
+    mapping = (known_mappings or {}).get(digest)
+    detected = resolve_column_mapping(sample.columns, mapping) if mapping else None
+    used = detected is not None
+    if not used:
+        detected = smart_detect_columns(sample, sample_size=sample_size)
+    
+    memo = {
+        'header_hash': digest,
+        'used': used,
+        'roles': dict(detected, numeric_columns=list(detected['numeric_columns'])),
+    }
+    return detected, memo
+
+
+def process_dataframe(df, detected_cols, all_columns):
+    type_col = detected_cols['type_column']
+    numeric_cols = detected_cols['numeric_columns']
+    
+    total_equipment = len(df)
+    columns = extract_columns(df, detected_cols)
+    
+    averages = {}
+    ranges = {}
+    accumulators = {}
+    
+    for col in numeric_cols:
+        stats = RunningStats()
+        stats.update(columns['numeric'][col])
+        averages[col] = stats.mean
+        ranges[col] = stats.as_range()
+        accumulators[col] = stats.state()
+    
+    validation = ValidationReport()
+    validation.update(df, detected_cols, columns['numeric'])
+    
+    type_distribution = {}
+    if type_col:
+        type_distribution = df[type_col].value_counts().to_dict()
+    else:
+        type_distribution = {'Equipment': total_equipment}
+    
+    column_summary = build_column_summary(all_columns, detected_cols)
+    
+    return {
+        'total_equipment': total_equipment,
+        'averages': averages,
+        'ranges': ranges,
+        'type_distribution': type_distribution,
+        'accumulators': accumulators,
+        'validation': validation.state(),
+        'columns': columns,
+        'column_summary': column_summary,
+        'detected_structure': detected_cols
+    }
+
+
+def detected_column_names(detected_cols):
+    names = [detected_cols['name_column'], detected_cols['type_column']] + detected_cols['numeric_columns']
+    return list(dict.fromkeys(col for col in names if col))
+
+
+def looks_numeric(col, values):
+    parsed = pd.to_numeric(values, errors='coerce')
+    present = values.notna()
+    if not present.any():
+        return False
+    numeric_share = parsed[present].notna().mean()
+    if any(pattern in str(col).lower() for pattern in COLUMN_NAME_PATTERNS['numeric']):
+        return numeric_share > 0
+    return numeric_share >= 0.5
+
+
+def rejected_numeric_columns(sample, detected_cols, roles):
+    # Columns nominated as numeric (by the remembered mapping, by a reading-like
+    # name, or by mostly numeric sample values) that detection or the full read
+    # rejected. Their bad cells are reported wherever in the file they are.
+    kept = set(detected_column_names(detected_cols))
+    return [
+        col for col in sample.columns
+        if col not in kept and (col in roles['numeric_columns'] or looks_numeric(col, sample[col]))
+    ]
+
+
+class PrefixReplayReader(RawIOBase):
+    # Serves bytes already read for detection before continuing with the rest
+    # of the stream, so the prefix is not read from the source twice.
+    def __init__(self, prefix, stream):
+        self.prefix = memoryview(prefix)
+        self.offset = 0
+        self.stream = stream
+    
+    def readable(self):
+        return True
+    
+    def readinto(self, buffer):
+        if self.offset < len(self.prefix):
+            size = min(len(buffer), len(self.prefix) - self.offset)
+            buffer[:size] = self.prefix[self.offset:self.offset + size]
+            self.offset += size
+            return size
+        
+        data = self.stream.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+
+class CsvSource:
+    # Column roles are detected on a prefix of the file; the full read is then
+    # limited to those columns with their dtypes given up front.
+    def __init__(self, csv_file, engine=None):
+        self.stream = csv_file
+        self.engine = engine or settings.CSV_PARSE_ENGINE
+        self.prefix = csv_file.read(settings.CSV_DETECTION_PREFIX_BYTES)
+        
+        sample_bytes = self.prefix
+        if len(self.prefix) == settings.CSV_DETECTION_PREFIX_BYTES:
+            sample_bytes = self.prefix[:self.prefix.rfind(b'\n') + 1] or self.prefix
+        self.sample = pd.read_csv(BytesIO(sample_bytes))
+        self.column_memo = None
+    
+    @property
+    def column_names(self):
+        return self.sample.columns.tolist()
+    
+    def detect_columns(self, known_mappings=None):
+        if self.sample.empty:
+            return None
+        detected, self.column_memo = detect_with_memo(self.sample, known_mappings)
+        return detected
+    
+    def _replay(self):
+        return BufferedReader(PrefixReplayReader(self.prefix, self.stream))
+    
+    def rejected_columns(self, detected_cols):
+        # Appends resolve their columns without detection and skip this
+        if self.column_memo is None:
+            return []
+        return rejected_numeric_columns(self.sample, detected_cols, self.column_memo['roles'])
+    
+    def read_options(self, detected_cols, numeric_dtypes=True):
+        # Rejected numeric columns are read too, only to be validated
+        dtype = {col: str for col in (detected_cols['name_column'], detected_cols['type_column']) if col}
+        if numeric_dtypes:
+            dtype.update({col: 'float64' for col in detected_cols['numeric_columns']})
+        return {'usecols': detected_column_names(detected_cols) + self.rejected_columns(detected_cols), 'dtype': dtype}
+    
+    def read_frame(self, detected_cols):
+        try:
+            return pd.read_csv(self._replay(), engine=self.engine, **self.read_options(detected_cols))
+        except ValueError:
+            pass
+        
+        # A value past the prefix did not fit the float64 hint. Read again
+        # unhinted and drop the numeric columns that do not parse in full,
+        # as smart_detect_columns would have on the whole file.
+        self.stream.seek(0)
+        df = pd.read_csv(self.stream, engine=self.engine, **self.read_options(detected_cols, numeric_dtypes=False))
+        for col in list(detected_cols['numeric_columns']):
+            try:
+                pd.to_numeric(df[col], errors='raise')
+            except (ValueError, TypeError):
+                detected_cols['numeric_columns'].remove(col)
+        return df
+    
+    def iter_frames(self, detected_cols, chunksize):
+        # Chunked reads need the C engine, and numeric columns are left
+        # unhinted because there is no re-reading rows already inserted.
+        return pd.read_csv(self._replay(), chunksize=chunksize, **self.read_options(detected_cols, numeric_dtypes=False))
+
+
+def process_csv_file(csv_file, engine=None, known_mappings=None):
     try:
-        df = pd.read_csv(csv_file)
+        source = CsvSource(csv_file, engine)
+        detected_cols = source.detect_columns(known_mappings)
         
-        if df.empty:
+        if detected_cols is None:
             return False, "CSV file is empty"
         
-        detected_cols = smart_detect_columns(df)
+        error = detection_error(detected_cols)
+        if error:
+            return False, error
         
-        name_col = detected_cols['name_column']
-        type_col = detected_cols['type_column']
-        numeric_cols = detected_cols['numeric_columns']
+        df = source.read_frame(detected_cols)
         
-        if not name_col:
-            return False, "Could not detect equipment name column"
+        error = detection_error(detected_cols)
+        if error:
+            return False, error
         
-        if len(numeric_cols) < 1:
-            return False, "No numeric data columns found. CSV must contain at least one numeric column."
+        result = process_dataframe(df, detected_cols, source.column_names)
+        result['column_memo'] = source.column_memo
         
-        total_equipment = len(df)
+        rejected = source.rejected_columns(detected_cols)
+        if rejected:
+            validation = ValidationReport.from_state(result['validation'])
+            validation.check_dropped(df, rejected)
+            result['validation'] = validation.state()
+        return True, result
+        
+    except Exception as e:
+        return False, f"Error processing CSV: {str(e)}"
+
+
+COLUMNAR_FORMATS = {
+    '.parquet': 'parquet',
+    '.pq': 'parquet',
+    '.feather': 'ipc',
+    '.arrow': 'ipc',
+    '.ipc': 'ipc',
+}
+CSV_COMPRESSIONS = {
+    '.gz': gzip.open,
+    '.bz2': bz2.open,
+    '.xz': lzma.open,
+}
+SUPPORTED_UPLOAD_EXTENSIONS = ('.csv',) + tuple(f'.csv{ext}' for ext in CSV_COMPRESSIONS) + tuple(COLUMNAR_FORMATS)
+UNSUPPORTED_FILE_MESSAGE = 'File must be a CSV (optionally .gz, .bz2 or .xz compressed), Parquet or Arrow/Feather file'
+COLUMNAR_SAMPLE_ROWS = 10000
+
+
+def upload_format(name):
+    return COLUMNAR_FORMATS.get(os.path.splitext(name)[1].lower(), 'csv')
+
+
+def upload_compression(name):
+    base, extension = os.path.splitext(name.lower())
+    if base.endswith('.csv'):
+        return CSV_COMPRESSIONS.get(extension)
+    return None
+
+
+def open_csv_stream(data_file, name):
+    # Compressed CSVs are decompressed as the parser reads them, never to disk
+    decompressor = upload_compression(name)
+    if decompressor:
+        return decompressor(data_file, 'rb')
+    return data_file
+
+
+def upload_extension(name):
+    extension = os.path.splitext(name)[1].lower()
+    if upload_compression(name):
+        return '.csv' + extension
+    return extension
+
+
+def is_supported_upload(name):
+    return name.lower().endswith(SUPPORTED_UPLOAD_EXTENSIONS)
+
+
+def local_file_path(data_file):
+    if hasattr(data_file, 'temporary_file_path'):
+        return data_file.temporary_file_path()
+    path = getattr(getattr(data_file, 'file', data_file), 'name', None)
+    if isinstance(path, str) and os.path.isfile(path):
+        return path
+    return None
+
+
+class ColumnarSource:
+    # Parquet or Arrow IPC/Feather input. Files on local disk are memory-mapped
+    # and only the projected columns are ever decoded.
+    def __init__(self, data_file, file_format):
+        try:
+            import pyarrow as pa
+            import pyarrow.ipc
+            import pyarrow.parquet
+        except ImportError:
+            raise ValueError("Parquet/Arrow uploads require the pyarrow package")
         
-        averages = {}
-        ranges = {}
+        self.pa = pa
+        self.file_format = file_format
+        self.column_memo = None
+        path = local_file_path(data_file)
         
-        for col in numeric_cols:
-            try:
-                numeric_data = pd.to_numeric(df[col], errors='coerce')
-                averages[col] = float(numeric_data.mean())
-                ranges[col] = {
-                    'min': float(numeric_data.min()),
-                    'max': float(numeric_data.max()),
-                    'std': float(numeric_data.std()),
-                }
-            except Exception as e:
-                print(f"Error processing column {col}: {e}")
-                continue
+        if path:
+            source = pa.memory_map(path)
+        else:
+            data_file.seek(0)
+            source = pa.BufferReader(data_file.read())
         
-        type_distribution = {}
-        if type_col:
-            type_distribution = df[type_col].value_counts().to_dict()
+        if file_format == 'parquet':
+            self.reader = pa.parquet.ParquetFile(source)
+            self.schema = self.reader.schema_arrow
         else:
-            type_distribution = {'Equipment': total_equipment}
-        
-        equipment_list = []
-        for idx, row in df.iterrows():
-            equipment_data = {
-                'name': str(row[name_col]),
-                'type': str(row[type_col]) if type_col else 'Equipment',
-                'numeric_data': {}
-            }
+            self.reader = pa.ipc.open_file(source)
+            self.schema = self.reader.schema
+    
+    @property
+    def column_names(self):
+        return self.schema.names
+    
+    def _to_frame(self, data):
+        df = data.to_pandas()
+        for col in df.columns:
+            if isinstance(df[col].dtype, pd.CategoricalDtype):
+                df[col] = df[col].astype(object)
+        return df
+    
+    def _batches(self, columns, batch_size):
+        if self.file_format == 'parquet':
+            yield from self.reader.iter_batches(batch_size=batch_size, columns=columns)
+            return
+        
+        for index in range(self.reader.num_record_batches):
+            batch = self.pa.Table.from_batches([self.reader.get_batch(index)]).select(columns)
+            for offset in range(0, batch.num_rows, batch_size):
+                yield batch.slice(offset, batch_size)
+    
+    def sample_frame(self, rows):
+        batch = next(self._batches(self.column_names, rows), None)
+        if batch is None:
+            return pd.DataFrame(columns=self.column_names)
+        return self._to_frame(batch.slice(0, rows))
+    
+    def detect_columns(self, known_mappings=None):
+        sample = self.sample_frame(settings.COLUMN_DETECTION_SAMPLE_SIZE or COLUMNAR_SAMPLE_ROWS)
+        if sample.empty:
+            return None
+        self.sample = sample
+        detected, self.column_memo = detect_with_memo(sample, known_mappings, sample_size=0)
+        return detected
+    
+    def rejected_columns(self, detected_cols):
+        # Appends resolve their columns without detection and skip this
+        if self.column_memo is None:
+            return []
+        return rejected_numeric_columns(self.sample, detected_cols, self.column_memo['roles'])
+    
+    def read_frame(self, detected_cols):
+        columns = detected_column_names(detected_cols) + self.rejected_columns(detected_cols)
+        if self.file_format == 'parquet':
+            return self._to_frame(self.reader.read(columns=columns))
+        return self._to_frame(self.reader.read_all().select(columns))
+    
+    def iter_frames(self, detected_cols, batch_size):
+        columns = detected_column_names(detected_cols) + self.rejected_columns(detected_cols)
+        for batch in self._batches(columns, batch_size):
+            yield self._to_frame(batch)
+
+
+def process_columnar_file(data_file, file_format, known_mappings=None):
+    try:
+        source = ColumnarSource(data_file, file_format)
+        detected_cols = source.detect_columns(known_mappings)
+        
+        if detected_cols is None:
+            return False, "File is empty"
+        
+        error = detection_error(detected_cols)
+        if error:
+            return False, error
+        
+        df = source.read_frame(detected_cols)
+        result = process_dataframe(df, detected_cols, source.column_names)
+        result['column_memo'] = source.column_memo
+        
+        rejected = source.rejected_columns(detected_cols)
+        if rejected:
+            validation = ValidationReport.from_state(result['validation'])
+            validation.check_dropped(df, rejected)
+            result['validation'] = validation.state()
+        return True, result
+        
+    except Exception as e:
+        return False, f"Error processing file: {str(e)}"
+
+
+def process_data_file(data_file, name, known_mappings=None):
+    file_format = upload_format(name)
+    if file_format == 'csv':
+        return process_csv_file(open_csv_stream(data_file, name), known_mappings=known_mappings)
+    return process_columnar_file(data_file, file_format, known_mappings=known_mappings)
+
+
+def process_file_streaming(data_file, dataset, name, chunksize=None, progress=None, known_mappings=None):
+    chunksize = chunksize or settings.INGEST_CHUNK_SIZE
+    file_format = upload_format(name)
+    
+    try:
+        # Roles are detected from a sample before the first chunk is read, and
+        # only the detected columns are streamed.
+        if file_format == 'csv':
+            source = CsvSource(open_csv_stream(data_file, name))
+        else:
+            source = ColumnarSource(data_file, file_format)
+        
+        detected_cols = source.detect_columns(known_mappings)
+        if detected_cols is None:
+            return False, "CSV file is empty" if file_format == 'csv' else "File is empty"
+        
+        error = detection_error(detected_cols)
+        if error:
+            return False, error
+        
+        column_summary = build_column_summary(source.column_names, detected_cols)
+        rejected = source.rejected_columns(detected_cols)
+        stats = {col: RunningStats() for col in detected_cols['numeric_columns']}
+        validation = ValidationReport()
+        type_counts = Counter()
+        total_equipment = 0
+        
+        for chunk in source.iter_frames(detected_cols, chunksize):
+            if chunk.empty:
+                continue
             
-            for col in numeric_cols:
-                try:
-                    equipment_data['numeric_data'][col] = float(pd.to_numeric(row[col], errors='coerce'))
-                except:
-                    equipment_data['numeric_data'][col] = 0.0
+            columns = extract_columns(chunk, detected_cols)
+            save_equipment_data(dataset, columns, column_summary, update_averages=False)
+            append_column_store(dataset, columns['numeric'])
             
-            equipment_list.append(equipment_data)
-        
-        column_summary = {
-            'total_columns': len(df.columns),
-            'name_column': name_col,
-            'type_column': type_col,
-            'numeric_columns': numeric_cols,
-            'all_columns': df.columns.tolist()
-        }
+            for col, col_stats in stats.items():
+                col_stats.update(columns['numeric'][col])
+            validation.update(chunk, detected_cols, columns['numeric'], offset=total_equipment)
+            validation.check_dropped(chunk, rejected, offset=total_equipment)
+            
+            if detected_cols['type_column']:
+                type_counts.update(chunk[detected_cols['type_column']].value_counts().to_dict())
+            else:
+                type_counts['Equipment'] += len(chunk)
+            
+            total_equipment += len(chunk)
+            if progress:
+                progress('inserting', total_equipment, dataset)
+        
+        dataset.total_equipment = total_equipment
+        set_parameter_averages(dataset, stats, detected_cols['numeric_columns'])
+        dataset.save()
         
         data = {
             'total_equipment': total_equipment,
-            'averages': averages,
-            'ranges': ranges,
-            'type_distribution': type_distribution,
-            'equipment_list': equipment_list,
+            'averages': {col: col_stats.mean for col, col_stats in stats.items()},
+            'ranges': {col: col_stats.as_range() for col, col_stats in stats.items()},
+            'accumulators': {col: col_stats.state() for col, col_stats in stats.items()},
+            'validation': validation.state(),
+            'type_distribution': dict(type_counts),
             'column_summary': column_summary,
-            'detected_structure': detected_cols
+            'detected_structure': detected_cols,
+            'column_memo': source.column_memo,
         }
         
         return True, data
         
     except Exception as e:
-        return False, f"Error processing CSV: {str(e)}"
+        return False, f"Error processing file: {str(e)}"
 
 
-def save_equipment_data(dataset, equipment_list, column_summary):
-    equipment_objects = []
+def set_parameter_averages(dataset, stats, numeric_cols):
+    param_means = [stats[col].mean if stats[col].count else 0.0 for col in numeric_cols[:len(EQUIPMENT_PARAMETER_FIELDS)]]
+    param_means += [0.0] * (len(EQUIPMENT_PARAMETER_FIELDS) - len(param_means))
     
+    dataset.avg_flowrate = round(param_means[0], 2)
+    dataset.avg_pressure = round(param_means[1], 2)
+    dataset.avg_temperature = round(param_means[2], 2)
+
+
+def parameter_arrays(columns, column_summary):
     numeric_cols = column_summary['numeric_columns']
+    count = len(columns['name'])
     
-    flowrate_sum = 0
-    pressure_sum = 0
-    temperature_sum = 0
-    count = len(equipment_list)
+    arrays = {}
+    for idx, field in enumerate(EQUIPMENT_PARAMETER_FIELDS):
+        if idx < len(numeric_cols):
+            arrays[field] = np.asarray(columns['numeric'][numeric_cols[idx]], dtype=np.float64)
+        else:
+            arrays[field] = np.zeros(count, dtype=np.float64)
     
-    for item in equipment_list:
-        equipment_data = {
-            'dataset': dataset,
-            'equipment_name': item['name'],
-            'equipment_type': item['type'],
+    return arrays
+
+
+def save_equipment_data(dataset, columns, column_summary, update_averages=True):
+    count = len(columns['name'])
+    params = parameter_arrays(columns, column_summary)
+    
+    if dataset.storage_mode == 'packed':
+        append_packed_equipment(dataset, columns['name'], columns['type'], params)
+    else:
+        bulk_load_equipment(dataset.id, columns['name'], columns['type'], params)
+    
+    if update_averages and count > 0:
+        # Missing readings are stored as NULL and left out of the averages
+        for field in EQUIPMENT_PARAMETER_FIELDS:
+            values = params[field][~np.isnan(params[field])]
+            setattr(dataset, f'avg_{field}', round(float(values.mean()), 2) if len(values) else 0.0)
+        dataset.save()
+
+
+DATASETS_PER_USER = 5
+
+
+def apply_dataset_retention(user, keep=()):
+    # Datasets in keep (those a batch upload just returned) are never dropped
+    # and count towards the limit, so a large batch evicts only older datasets.
+    keep = set(keep)
+    recent = Dataset.objects.filter(uploaded_by=user).order_by('-uploaded_at').values_list('id', flat=True)
+    stale = [dataset_id for dataset_id in recent if dataset_id not in keep][max(DATASETS_PER_USER - len(keep), 0):]
+    delete_datasets(Dataset.objects.filter(id__in=stale))
+
+
+def delete_datasets(queryset):
+    # Datasets disappear from the API at once; their rows and files are
+    # purged after the request, so callers never wait on the cascade.
+    deleted = queryset.update(deleted_at=timezone.now())
+    if deleted and settings.DATASET_PURGE_THREAD:
+        transaction.on_commit(start_purge_thread)
+    return deleted
+
+
+def purge_deleted_datasets():
+    ids = list(Dataset.all_objects.filter(deleted_at__isnull=False).values_list('id', flat=True))
+    if not ids:
+        return 0
+    
+    # Partitioned equipment is dropped with its partition; anything else goes
+    # in batches of plain DELETEs, so no one statement holds the write lock for
+    # a whole multi-million row dataset.
+    drop_dataset_partitions(ids)
+    batch_size = settings.DATASET_PURGE_BATCH_ROWS
+    while True:
+        batch = Equipment.objects.filter(dataset_id__in=ids).values('id')[:batch_size]
+        if not Equipment.objects.filter(id__in=batch).delete()[0]:
+            break
+    
+    stored_names = set(Dataset.all_objects.filter(id__in=ids).values_list('file_path', flat=True))
+    Dataset.all_objects.filter(id__in=ids).delete()
+    for stored_name in stored_names:
+        release_stored_file(stored_name)
+    return len(ids)
+
+
+PURGE_LOCK = threading.Lock()
+
+
+def purge_in_background():
+    if not PURGE_LOCK.acquire(blocking=False):
+        return
+    try:
+        while purge_deleted_datasets():
+            pass
+    except Exception as e:
+        print(f"⚠️ Dataset purge failed, the ingestion worker will retry: {e}")
+    finally:
+        PURGE_LOCK.release()
+        connection.close()
+
+
+def start_purge_thread():
+    threading.Thread(target=purge_in_background, daemon=True).start()
+
+
+def json_safe(value):
+    if isinstance(value, dict):
+        return {str(key): json_safe(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [json_safe(item) for item in value]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not np.isfinite(value):
+        return None
+    return value
+
+
+def build_parse_summary(result):
+    return json_safe({
+        'column_summary': result['column_summary'],
+        'averages': result['averages'],
+        'ranges': result['ranges'],
+        'type_distribution': result['type_distribution'],
+    })
+
+
+def file_content_hash(data_file):
+    # Uploads received over HTTP are hashed by api.upload_handlers while the
+    # request body is read; other sources are hashed here in one pass.
+    content_hash = getattr(data_file, 'content_hash', None)
+    if content_hash:
+        return content_hash
+    
+    hasher = hashlib.sha256()
+    for chunk in data_file.chunks():
+        hasher.update(chunk)
+    data_file.seek(0)
+    return hasher.hexdigest()
+
+
+def content_storage_name(content_hash, name):
+    extension = upload_extension(name) or '.csv'
+    return f'uploads/{content_hash}{extension}'
+
+
+def store_content_addressed(data_file, content_hash, name):
+    # Identical uploads share one file on disk, whoever uploaded them.
+    storage_name = content_storage_name(content_hash, name)
+    if default_storage.exists(storage_name):
+        return storage_name, False
+    
+    stored_name = default_storage.save(storage_name, data_file)
+    data_file.seek(0)
+    return stored_name, True
+
+
+def release_stored_file(stored_name):
+    if not stored_name:
+        return
+    if Dataset.all_objects.filter(file_path=stored_name).exists():
+        return
+    if IngestionJob.objects.filter(file=stored_name, status__in=['queued', 'running']).exists():
+        return
+    default_storage.delete(stored_name)
+
+
+def find_duplicate_dataset(user, content_hash):
+    return Dataset.objects.filter(uploaded_by=user, content_hash=content_hash).exclude(parse_summary={}).first()
+
+
+def reuse_duplicate_dataset(dataset):
+    dataset.uploaded_at = timezone.now()
+    dataset.save(update_fields=['uploaded_at'])
+    
+    result = dict(dataset.parse_summary)
+    result['total_equipment'] = dataset.total_equipment
+    result['duplicate'] = True
+    return result
+
+
+UPLOAD_SESSION_READ_SIZE = 64 * 1024
+
+
+def upload_session_path(session):
+    return os.path.join(settings.MEDIA_ROOT, 'partial', f'{session.id}.part')
+
+
+def create_upload_session_file(session):
+    path = upload_session_path(session)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    open(path, 'wb').close()
+
+
+def write_upload_session_chunk(session, start, stream, length):
+    # Bytes that arrived before a dropped connection are kept, so the client
+    # resumes from wherever the server actually got to.
+    written = 0
+    with open(upload_session_path(session), 'r+b') as f:
+        f.seek(start)
+        while stream is not None and written < length:
+            chunk = stream.read(min(UPLOAD_SESSION_READ_SIZE, length - written))
+            if not chunk:
+                break
+            f.write(chunk)
+            written += len(chunk)
+        f.truncate()
+    return written
+
+
+def move_into_storage(path, storage_name):
+    if default_storage.exists(storage_name):
+        os.remove(path)
+    else:
+        target = default_storage.path(storage_name)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        os.replace(path, target)
+
+
+def store_upload_session_file(session):
+    path = upload_session_path(session)
+    with open(path, 'rb') as f:
+        content_hash = file_content_hash(File(f))
+    
+    storage_name = content_storage_name(content_hash, session.file_name)
+    move_into_storage(path, storage_name)
+    
+    return storage_name, content_hash
+
+
+def discard_upload_session_file(session):
+    path = upload_session_path(session)
+    if os.path.exists(path):
+        os.remove(path)
+
+
+TEE_READ_SIZE = 1024 * 1024
+
+
+class TeeReader(RawIOBase):
+    # Every byte handed to the parser is also written to sink and fed to the
+    # hasher, so the upload is read exactly once.
+    def __init__(self, source, sink, hasher=None):
+        self.source = source
+        self.sink = sink
+        self.hasher = hasher
+        self.position = 0
+    
+    def readable(self):
+        return True
+    
+    def seekable(self):
+        return True
+    
+    def tell(self):
+        return self.position
+    
+    def seek(self, offset, whence=0):
+        # Only a rewind to the start is supported; the spool and the hash
+        # start over with the parser.
+        if offset or whence:
+            raise UnsupportedOperation('TeeReader can only rewind to the start')
+        self.source.seek(0)
+        self.sink.seek(0)
+        self.sink.truncate()
+        if self.hasher is not None:
+            self.hasher = hashlib.sha256()
+        self.position = 0
+        return 0
+    
+    def readinto(self, buffer):
+        data = self.source.read(len(buffer))
+        if data:
+            buffer[:len(data)] = data
+            self.sink.write(data)
+            if self.hasher is not None:
+                self.hasher.update(data)
+            self.position += len(data)
+        return len(data)
+
+
+class StorageTee:
+    # Spools the upload into MEDIA_ROOT while it is parsed; commit() moves the
+    # spooled copy to its content-addressed name.
+    def __init__(self, data_file, name, content_hash=None):
+        self.name = name
+        self.content_hash = content_hash
+        self.path = os.path.join(settings.MEDIA_ROOT, 'partial', f'{uuid.uuid4().hex}.part')
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        
+        self.sink = open(self.path, 'wb')
+        data_file.seek(0)
+        self.tee = TeeReader(data_file, self.sink, None if content_hash else hashlib.sha256())
+        self.reader = BufferedReader(self.tee, TEE_READ_SIZE)
+    
+    def commit(self):
+        # The parser may stop before EOF (e.g. trailing blank lines), so the
+        # rest of the stream is copied through the tee as well.
+        while self.reader.read(TEE_READ_SIZE):
+            pass
+        self.sink.close()
+        
+        if self.tee.hasher is not None:
+            self.content_hash = self.tee.hasher.hexdigest()
+        
+        storage_name = content_storage_name(self.content_hash, self.name)
+        move_into_storage(self.path, storage_name)
+        return storage_name, self.content_hash
+    
+    def discard(self):
+        self.sink.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def store_parsed_dataset(user, name, file_path, result, content_hash='', progress=None):
+    # The dataset and its rows commit together: find_duplicate_dataset treats
+    # any dataset with a parse_summary as complete.
+    storage_mode = equipment_storage_mode(result['total_equipment'])
+    dataset_id = reserve_dataset_partition() if storage_mode == 'rows' else None
+    try:
+        with transaction.atomic():
+            dataset = Dataset.objects.create(
+                id=dataset_id,
+                name=name,
+                uploaded_by=user,
+                file_path=file_path,
+                content_hash=content_hash,
+                parse_summary=build_parse_summary(result),
+                accumulators=json_safe(result['accumulators']),
+                validation_report=result['validation'],
+                storage_mode=storage_mode,
+                total_equipment=result['total_equipment'],
+                avg_flowrate=0,
+                avg_pressure=0,
+                avg_temperature=0
+            )
+            if progress:
+                progress('inserting', 0, dataset)
+            save_equipment_data(dataset, result['columns'], result['column_summary'])
+    except Exception:
+        if dataset_id is not None:
+            drop_dataset_partitions([dataset_id])
+        release_stored_file(file_path)
+        raise
+    
+    append_column_store(dataset, result['columns']['numeric'])
+    dataset.save(update_fields=['column_store'])
+    if progress:
+        progress('inserting', result['total_equipment'], dataset)
+    
+    return dataset
+
+
+def user_column_mappings(user):
+    return {
+        mapping.header_hash: {
+            'name_column': mapping.name_column,
+            'type_column': mapping.type_column,
+            'numeric_columns': mapping.numeric_columns,
         }
+        for mapping in ColumnMapping.objects.filter(user=user)
+    }
+
+
+def remember_column_mapping(user, result):
+    memo = result['column_memo']
+    if memo['used']:
+        ColumnMapping.objects.filter(user=user, header_hash=memo['header_hash']).update(
+            use_count=models.F('use_count') + 1,
+            last_used_at=timezone.now(),
+        )
+        return
+    
+    roles = memo['roles']
+    ColumnMapping.objects.update_or_create(
+        user=user,
+        header_hash=memo['header_hash'],
+        defaults={
+            'header': result['column_summary']['all_columns'],
+            'name_column': roles['name_column'],
+            'type_column': roles['type_column'],
+            'numeric_columns': roles['numeric_columns'],
+            'last_used_at': timezone.now(),
+        },
+    )
+
+
+def ingest_dataset(user, data_file, name, streaming=False, content_hash=None, stored_name=None, progress=None):
+    # Shared by the synchronous upload view and the background job worker.
+    # progress(phase, rows_processed, dataset) is called as work advances.
+    if not stored_name and upload_format(name) == 'csv':
+        return ingest_dataset_tee(user, data_file, name, streaming, content_hash, progress)
+    
+    content_hash = content_hash or file_content_hash(data_file)
+    
+    existing = find_duplicate_dataset(user, content_hash)
+    if existing:
+        return True, reuse_duplicate_dataset(existing), existing
+    
+    if not stored_name:
+        stored_name, _ = store_content_addressed(data_file, content_hash, name)
+    
+    if streaming:
+        dataset = Dataset.objects.create(name=name, uploaded_by=user, file_path=stored_name, content_hash=content_hash, storage_mode=equipment_storage_mode())
+        data_file.seek(0)
+        if progress:
+            progress('parsing', 0, dataset)
+        success, result = process_file_streaming(data_file, dataset, name, progress=progress, known_mappings=user_column_mappings(user))
+        
+        if not success:
+            # Purging the dataset also releases the stored upload
+            delete_datasets(Dataset.objects.filter(pk=dataset.pk))
+            return False, result, None
         
-        if len(numeric_cols) > 0:
-            val = item['numeric_data'].get(numeric_cols[0], 0.0)
-            equipment_data['flowrate'] = val
-            flowrate_sum += val
+        dataset.parse_summary = build_parse_summary(result)
+        dataset.accumulators = json_safe(result['accumulators'])
+        dataset.validation_report = result['validation']
+        dataset.save(update_fields=['parse_summary', 'accumulators', 'validation_report'])
+    else:
+        if progress:
+            progress('parsing', 0, None)
+        success, result = process_data_file(data_file, name, known_mappings=user_column_mappings(user))
+        
+        if not success:
+            release_stored_file(stored_name)
+            return False, result, None
+        
+        dataset = store_parsed_dataset(user, name, stored_name, result, content_hash=content_hash, progress=progress)
+    
+    return finish_ingestion(user, dataset, result, progress)
+
+
+def ingest_dataset_tee(user, data_file, name, streaming, content_hash, progress):
+    # CSV uploads that are not in storage yet are written to storage, hashed
+    # and parsed in a single read of the upload.
+    content_hash = content_hash or getattr(data_file, 'content_hash', None)
+    if content_hash:
+        existing = find_duplicate_dataset(user, content_hash)
+        if existing:
+            return True, reuse_duplicate_dataset(existing), existing
+    
+    tee = StorageTee(data_file, name, content_hash)
+    dataset = None
+    try:
+        if streaming:
+            dataset = Dataset.objects.create(name=name, uploaded_by=user, content_hash=content_hash or '', storage_mode=equipment_storage_mode())
+            if progress:
+                progress('parsing', 0, dataset)
+            success, result = process_file_streaming(tee.reader, dataset, name, progress=progress, known_mappings=user_column_mappings(user))
         else:
-            equipment_data['flowrate'] = 0.0
-            
-        if len(numeric_cols) > 1:
-            val = item['numeric_data'].get(numeric_cols[1], 0.0)
-            equipment_data['pressure'] = val
-            pressure_sum += val
+            if progress:
+                progress('parsing', 0, None)
+            success, result = process_data_file(tee.reader, name, known_mappings=user_column_mappings(user))
+        
+        if success:
+            stored_name, content_hash = tee.commit()
+    finally:
+        if os.path.exists(tee.path):
+            tee.discard()
+    
+    if not success:
+        if dataset:
+            delete_datasets(Dataset.objects.filter(pk=dataset.pk))
+        return False, result, None
+    
+    if streaming:
+        dataset.file_path = stored_name
+        dataset.content_hash = content_hash
+        dataset.parse_summary = build_parse_summary(result)
+        dataset.accumulators = json_safe(result['accumulators'])
+        dataset.validation_report = result['validation']
+        dataset.save(update_fields=['file_path', 'content_hash', 'parse_summary', 'accumulators', 'validation_report'])
+    else:
+        existing = find_duplicate_dataset(user, content_hash)
+        if existing:
+            return True, reuse_duplicate_dataset(existing), existing
+        dataset = store_parsed_dataset(user, name, stored_name, result, content_hash=content_hash, progress=progress)
+    
+    return finish_ingestion(user, dataset, result, progress)
+
+
+def finish_ingestion(user, dataset, result, progress=None):
+    remember_column_mapping(user, result)
+    if progress:
+        progress('finalizing', dataset.total_equipment, dataset)
+    refresh_dataset_statistics(dataset)
+    apply_dataset_retention(user)
+    dataset.refresh_from_db()
+    
+    return True, result, dataset
+
+
+def process_data_payload(name, payload, known_mappings=None):
+    return process_data_file(BytesIO(payload), name, known_mappings=known_mappings)
+
+
+def extract_archive_members(archive):
+    members = []
+    with zipfile.ZipFile(archive) as zf:
+        for info in zf.infolist():
+            file_name = os.path.basename(info.filename)
+            if info.is_dir() or info.filename.startswith('__MACOSX/') or not is_supported_upload(file_name):
+                continue
+            members.append((file_name, zf.read(info)))
+    return members
+
+
+def ingest_batch(user, payloads):
+    # Files are parsed in a process pool; rows are written from this process as
+    # each parse result arrives so inserts overlap with the remaining parses.
+    results = {}
+    pending = []
+    # Later copies of a file that appears more than once in the batch resolve
+    # to the first copy's dataset once it is stored.
+    first_copies = {}
+    repeats = []
+    for index, (name, payload) in enumerate(payloads):
+        content_hash = hashlib.sha256(payload).hexdigest()
+        if content_hash in first_copies:
+            repeats.append((index, name, first_copies[content_hash]))
+            continue
+        first_copies[content_hash] = index
+        
+        existing = find_duplicate_dataset(user, content_hash)
+        if existing:
+            reuse_duplicate_dataset(existing)
+            results[index] = {
+                'file': name,
+                'success': True,
+                'duplicate': True,
+                'dataset_id': existing.id,
+                'total_equipment': existing.total_equipment,
+                'column_summary': existing.parse_summary.get('column_summary'),
+                'validation': existing.validation_report,
+            }
         else:
-            equipment_data['pressure'] = 0.0
+            pending.append((index, name, payload, content_hash))
+    
+    workers = min(settings.INGEST_BATCH_WORKERS, len(pending))
+    names = [name for _, name, _, _ in pending]
+    raw_payloads = [payload for _, _, payload, _ in pending]
+    known_mappings = [user_column_mappings(user)] * len(pending)
+    
+    pool = None
+    if workers > 1:
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=django.setup)
+        parsed = pool.map(process_data_payload, names, raw_payloads, known_mappings)
+    else:
+        parsed = map(process_data_payload, names, raw_payloads, known_mappings)
+    
+    try:
+        for (index, name, payload, content_hash), (success, result) in zip(pending, parsed):
+            if not success:
+                results[index] = {'file': name, 'success': False, 'error': result}
+                continue
             
-        if len(numeric_cols) > 2:
-            val = item['numeric_data'].get(numeric_cols[2], 0.0)
-            equipment_data['temperature'] = val
-            temperature_sum += val
-        else:
-            equipment_data['temperature'] = 0.0
-        
-        equipment = Equipment(**equipment_data)
-        equipment_objects.append(equipment)
+            stored_name, _ = store_content_addressed(ContentFile(payload, name=name), content_hash, name)
+            dataset = store_parsed_dataset(user, name, stored_name, result, content_hash=content_hash)
+            refresh_dataset_statistics(dataset)
+            remember_column_mapping(user, result)
+            results[index] = {
+                'file': name,
+                'success': True,
+                'dataset_id': dataset.id,
+                'total_equipment': dataset.total_equipment,
+                'column_summary': result['column_summary'],
+                'column_memo_used': result['column_memo']['used'],
+                'validation': result['validation'],
+            }
+    finally:
+        if pool:
+            pool.shutdown()
     
-    Equipment.objects.bulk_create(equipment_objects)
+    for index, name, first_index in repeats:
+        first = results[first_index]
+        results[index] = dict(first, file=name, duplicate=True) if first['success'] else dict(first, file=name)
     
-    if count > 0:
-        dataset.avg_flowrate = round(flowrate_sum / count, 2)
-        dataset.avg_pressure = round(pressure_sum / count, 2)
-        dataset.avg_temperature = round(temperature_sum / count, 2)
-        dataset.save()
+    apply_dataset_retention(user, keep=[result['dataset_id'] for result in results.values() if result['success']])
+    return [results[index] for index in sorted(results)]
+
+
+def dataset_column_roles(dataset):
+    summary = dataset.parse_summary.get('column_summary')
+    if not summary:
+        return None
+    return {
+        'name_column': summary['name_column'],
+        'type_column': summary['type_column'],
+        'numeric_columns': list(summary['numeric_columns']),
+    }
+
+
+def accumulators_from_summary(dataset):
+    # Datasets stored before accumulators existed: rebuild them from the parse
+    # summary (mean, sample std, min, max) rather than rescanning equipment.
+    accumulators = {}
+    count = dataset.total_equipment
+    for col, mean in dataset.parse_summary.get('averages', {}).items():
+        col_range = dataset.parse_summary.get('ranges', {}).get(col, {})
+        std = col_range.get('std') or 0.0
+        accumulators[col] = {
+            'count': count,
+            'mean': mean,
+            'm2': std * std * (count - 1) if count > 1 else 0.0,
+            'min': col_range.get('min'),
+            'max': col_range.get('max'),
+        }
+    return accumulators
+
+
+def read_append_frame(data_file, name, roles):
+    file_format = upload_format(name)
+    if file_format == 'csv':
+        source = CsvSource(open_csv_stream(data_file, name))
+    else:
+        source = ColumnarSource(data_file, file_format)
+    
+    detected = resolve_column_mapping(source.column_names, roles)
+    if detected is None:
+        return None, None
+    # read_frame may drop numeric columns from the dict it is given
+    return source.read_frame(dict(detected, numeric_columns=list(detected['numeric_columns']))), detected
+
+
+def append_dataset_rows(dataset, data_file=None, name=None, rows=None):
+    # Appended rows must carry the dataset's own columns; only the new rows are
+    # parsed and inserted, and statistics are merged into the accumulators.
+    roles = dataset_column_roles(dataset)
+    if roles is None:
+        return False, "This dataset predates appends; upload it again to enable them"
+    
+    try:
+        if data_file is not None:
+            df, detected = read_append_frame(data_file, name, roles)
+        else:
+            df = pd.DataFrame(rows)
+            detected = resolve_column_mapping(df.columns, roles) if not df.empty else None
+        
+        if detected is None:
+            expected = ', '.join(detected_column_names(roles))
+            return False, f"Rows must contain the dataset's columns: {expected}"
+        
+        df = df.rename(columns=dict(zip(detected_column_names(detected), detected_column_names(roles))))
+        if df.empty:
+            return False, "No rows to append"
+        
+        columns = extract_columns(df, roles)
+        column_summary = dataset.parse_summary['column_summary']
+        count = len(columns['name'])
+        
+        lengths = None
+        try:
+            with transaction.atomic():
+                dataset = Dataset.objects.select_for_update().get(pk=dataset.pk)
+                lengths = column_store_lengths(dataset)
+                save_equipment_data(dataset, columns, column_summary, update_averages=False)
+                
+                accumulators = dataset.accumulators or accumulators_from_summary(dataset)
+                stats = {col: RunningStats.from_state(accumulators.get(col)) for col in roles['numeric_columns']}
+                for col, col_stats in stats.items():
+                    col_stats.update(columns['numeric'][col])
+                
+                validation = ValidationReport.from_state(dataset.validation_report)
+                validation.update(df, roles, columns['numeric'], offset=dataset.total_equipment)
+                
+                type_distribution = Counter(dataset.parse_summary.get('type_distribution', {}))
+                type_distribution.update(Counter(columns['type'].tolist()))
+                
+                dataset.total_equipment += count
+                set_parameter_averages(dataset, stats, roles['numeric_columns'])
+                dataset.accumulators = json_safe({col: col_stats.state() for col, col_stats in stats.items()})
+                dataset.validation_report = validation.state()
+                dataset.parse_summary = json_safe({
+                    'column_summary': column_summary,
+                    'averages': {col: col_stats.mean for col, col_stats in stats.items()},
+                    'ranges': {col: col_stats.as_range() for col, col_stats in stats.items()},
+                    'type_distribution': dict(type_distribution),
+                })
+                # The stored upload no longer matches the dataset's contents
+                dataset.content_hash = ''
+                append_column_store(dataset, columns['numeric'])
+                dataset.save()
+                merge_dataset_statistics(dataset, parameter_arrays(columns, column_summary), dict(type_distribution))
+        except Exception:
+            if lengths is not None:
+                truncate_column_store(dataset.column_store or {}, lengths)
+            raise
+        
+        return True, {
+            'appended': count,
+            'dataset': dataset,
+            'total_equipment': dataset.total_equipment,
+            'averages': dataset.parse_summary['averages'],
+            'ranges': dataset.parse_summary['ranges'],
+            'type_distribution': dataset.parse_summary['type_distribution'],
+            'validation': dataset.validation_report,
+        }
+        
+    except Exception as e:
+        return False, f"Error appending rows: {str(e)}"
+
+
+def box_plot_stats(stats):
+    # matplotlib bxp() input drawn from DatasetStatistics; outlier points are
+    # not stored, so only the box and whiskers are drawn.
+    if not stats:
+        return []
+    return [{
+        'q1': stats['q1'],
+        'med': stats['median'],
+        'q3': stats['q3'],
+        'whislo': stats['whisker_low'],
+        'whishi': stats['whisker_high'],
+        'fliers': [],
+    }]
+
+
+def draw_box_plot(ax, stats, **kwargs):
+    # A parameter with no numeric values has no statistics to draw
+    if not stats:
+        ax.text(0.5, 0.5, 'No data', ha='center', va='center', transform=ax.transAxes)
+        return
+    ax.bxp(box_plot_stats(stats), **kwargs)
 
 
-def create_chart_images(dataset):
+def create_chart_images(dataset, statistics):
     plt.style.use('seaborn-v0_8-darkgrid')
     colors_palette = ['#2563eb', '#10b981', '#f59e0b', '#ef4444', '#8b5cf6', '#06b6d4']
     
     chart_images = {}
     
-    type_dist = dataset.equipment.values('equipment_type').annotate(
-        count=models.Count('id')
-    )
-    types = [item['equipment_type'] for item in type_dist]
-    counts = [item['count'] for item in type_dist]
+    types = list(statistics.type_distribution)
+    counts = list(statistics.type_distribution.values())
     
     fig, ax = plt.subplots(figsize=(8, 5))
     bars = ax.bar(types, counts, color=colors_palette[:len(types)], edgecolor='white', linewidth=2)
@@ -258,7 +1545,7 @@ def create_chart_images(dataset):
     chart_images['pie_chart'] = buf2
     plt.close()
     
-    equipment_data = dataset.equipment.all()[:15]
+    equipment_data = dataset_equipment(dataset, 15)
     names = [eq.equipment_name[:15] for eq in equipment_data]
     param1 = [eq.flowrate for eq in equipment_data]
     param2 = [eq.pressure for eq in equipment_data]
@@ -285,25 +1572,21 @@ def create_chart_images(dataset):
     
     fig, axes = plt.subplots(1, 3, figsize=(12, 4))
     
-    all_flowrates = [eq.flowrate for eq in dataset.equipment.all()]
-    all_pressures = [eq.pressure for eq in dataset.equipment.all()]
-    all_temperatures = [eq.temperature for eq in dataset.equipment.all()]
-    
-    axes[0].boxplot(all_flowrates, vert=True, patch_artist=True,
+    draw_box_plot(axes[0], statistics.parameters['flowrate'], vert=True, patch_artist=True,
                     boxprops=dict(facecolor='#93c5fd', color='#2563eb'),
                     medianprops=dict(color='#1e40af', linewidth=2))
     axes[0].set_title('Parameter 1\nDistribution', fontweight='bold')
     axes[0].set_ylabel('Value', fontweight='bold')
     axes[0].grid(axis='y', alpha=0.3)
     
-    axes[1].boxplot(all_pressures, vert=True, patch_artist=True,
+    draw_box_plot(axes[1], statistics.parameters['pressure'], vert=True, patch_artist=True,
                     boxprops=dict(facecolor='#86efac', color='#10b981'),
                     medianprops=dict(color='#059669', linewidth=2))
     axes[1].set_title('Parameter 2\nDistribution', fontweight='bold')
     axes[1].set_ylabel('Value', fontweight='bold')
     axes[1].grid(axis='y', alpha=0.3)
     
-    axes[2].boxplot(all_temperatures, vert=True, patch_artist=True,
+    draw_box_plot(axes[2], statistics.parameters['temperature'], vert=True, patch_artist=True,
                     boxprops=dict(facecolor='#fcd34d', color='#f59e0b'),
                     medianprops=dict(color='#d97706', linewidth=2))
     axes[2].set_title('Parameter 3\nDistribution', fontweight='bold')
@@ -346,30 +1629,142 @@ class NumberedCanvas(canvas.Canvas):
         self.drawString(50, 30, "Chemical Equipment Visualizer - Analysis Report")
 
 
-def calculate_quartiles(values):
-    if not values or len(values) == 0:
+def parameter_statistics(values):
+    values = np.asarray(values, dtype=np.float64)
+    values = values[~np.isnan(values)]
+    n = len(values)
+    if n == 0:
         return None
     
-    sorted_vals = sorted(values)
-    n = len(sorted_vals)
-    
-    q1_idx = n // 4
-    q2_idx = n // 2
-    q3_idx = (3 * n) // 4
-    
-    q1 = sorted_vals[q1_idx]
-    median = sorted_vals[q2_idx]
-    q3 = sorted_vals[q3_idx]
+    # Quartiles are the sorted values at n//4, n//2 and 3n//4, as the report
+    # has always shown them, found with one partition rather than a sort
+    q1_idx, q2_idx, q3_idx = n // 4, n // 2, (3 * n) // 4
+    ordered = np.partition(values, [q1_idx, q2_idx, q3_idx])
+    q1, median, q3 = float(ordered[q1_idx]), float(ordered[q2_idx]), float(ordered[q3_idx])
     iqr = q3 - q1
     
+    mean = float(values.mean())
+    var = float(values.var())
+    std = float(np.sqrt(var))
+    
+    # Box plot whiskers: the most extreme values within 1.5 IQR of the box
     return {
+        'count': n,
+        'min': float(values.min()),
+        'max': float(values.max()),
+        'mean': mean,
+        'std': std,
+        'var': var,
+        'cv': std / mean * 100 if mean else 0.0,
         'q1': q1,
         'median': median,
         'q3': q3,
-        'iqr': iqr
+        'iqr': iqr,
+        'whisker_low': float(values[values >= q1 - 1.5 * iqr].min()),
+        'whisker_high': float(values[values <= q3 + 1.5 * iqr].max()),
+    }
+
+
+def dataset_parameter_arrays(dataset):
+    # The stored equipment parameters, read from the column store where the
+    # dataset has one and from its packed blocks or Equipment rows otherwise.
+    numeric_cols = dataset.parse_summary.get('column_summary', {}).get('numeric_columns', [])
+    if dataset.column_store:
+        arrays = {}
+        for idx, field in enumerate(EQUIPMENT_PARAMETER_FIELDS):
+            values = load_column(dataset, numeric_cols[idx]) if idx < len(numeric_cols) else None
+            arrays[field] = values if values is not None else np.zeros(dataset.total_equipment)
+        return arrays
+    
+    if dataset.storage_mode == 'packed':
+        return packed_parameter_arrays(dataset)
+    
+    rows = np.array(list(dataset.equipment.values_list(*EQUIPMENT_PARAMETER_FIELDS)), dtype=np.float64)
+    rows = rows.reshape(-1, len(EQUIPMENT_PARAMETER_FIELDS))
+    return {field: rows[:, idx] for idx, field in enumerate(EQUIPMENT_PARAMETER_FIELDS)}
+
+
+def refresh_dataset_statistics(dataset):
+    type_distribution = dataset.parse_summary.get('type_distribution')
+    if type_distribution is None:
+        type_dist = dataset.equipment.values('equipment_type').annotate(count=models.Count('id'))
+        type_distribution = {item['equipment_type']: item['count'] for item in type_dist}
+    
+    arrays = dataset_parameter_arrays(dataset)
+    statistics, _ = DatasetStatistics.objects.update_or_create(
+        dataset=dataset,
+        defaults={
+            'equipment_count': dataset.total_equipment,
+            'parameters': json_safe({field: parameter_statistics(values) for field, values in arrays.items()}),
+            'type_distribution': type_distribution,
+            'quartiles_stale': False,
+            'computed_at': timezone.now(),
+        },
+    )
+    return statistics
+
+
+def merge_parameter_statistics(stored, values):
+    # stored holds population figures, so M2 is var * count
+    stats = RunningStats()
+    if stored:
+        stats = RunningStats.from_state({
+            'count': stored['count'],
+            'mean': stored['mean'],
+            'm2': stored['var'] * stored['count'],
+            'min': stored['min'],
+            'max': stored['max'],
+        })
+    stats.update(values)
+    if stats.count == 0:
+        return None
+    
+    var = stats.m2 / stats.count
+    std = float(np.sqrt(var))
+    return {
+        'count': stats.count,
+        'min': stats.min,
+        'max': stats.max,
+        'mean': stats.mean,
+        'std': std,
+        'var': var,
+        'cv': std / stats.mean * 100 if stats.mean else 0.0,
     }
 
 
+def merge_dataset_statistics(dataset, params, type_distribution):
+    # Appends fold only the new rows into the stored figures instead of
+    # rescanning the dataset; quartiles are recomputed on the next read that
+    # needs them.
+    try:
+        statistics = dataset.statistics
+    except DatasetStatistics.DoesNotExist:
+        return None
+    
+    statistics.equipment_count = dataset.total_equipment
+    statistics.parameters = json_safe({
+        field: merge_parameter_statistics(statistics.parameters.get(field), params[field])
+        for field in EQUIPMENT_PARAMETER_FIELDS
+    })
+    statistics.type_distribution = type_distribution
+    statistics.quartiles_stale = True
+    statistics.computed_at = timezone.now()
+    statistics.save()
+    return statistics
+
+
+def dataset_statistics(dataset, quartiles=False):
+    # Datasets ingested before DatasetStatistics existed get theirs on first
+    # read, as do quartiles left stale by an append when the caller needs them.
+    try:
+        statistics = dataset.statistics
+    except DatasetStatistics.DoesNotExist:
+        return refresh_dataset_statistics(dataset)
+    if quartiles and statistics.quartiles_stale:
+        return refresh_dataset_statistics(dataset)
+    return statistics
+
+
 def generate_pdf_report_with_charts(dataset):
     buffer = BytesIO()
     doc = SimpleDocTemplate(
@@ -465,20 +1860,11 @@ def generate_pdf_report_with_charts(dataset):
     elements.append(Paragraph("1. Dataset Overview", heading2_style))
     elements.append(Spacer(1, 0.15*inch))
     
-    equipment_stats = dataset.equipment.aggregate(
-        max_flowrate=models.Max('flowrate'),
-        min_flowrate=models.Min('flowrate'),
-        std_flowrate=models.StdDev('flowrate'),
-        var_flowrate=models.Variance('flowrate'),
-        max_pressure=models.Max('pressure'),
-        min_pressure=models.Min('pressure'),
-        std_pressure=models.StdDev('pressure'),
-        var_pressure=models.Variance('pressure'),
-        max_temperature=models.Max('temperature'),
-        min_temperature=models.Min('temperature'),
-        std_temperature=models.StdDev('temperature'),
-        var_temperature=models.Variance('temperature'),
-    )
+    statistics = dataset_statistics(dataset, quartiles=True)
+    equipment_stats = {}
+    for field, stats in statistics.parameters.items():
+        for key in ('min', 'max', 'std', 'var'):
+            equipment_stats[f'{key}_{field}'] = (stats or {}).get(key)
     
     overview_data = [
         ['Metric', 'Value'],
@@ -486,9 +1872,9 @@ def generate_pdf_report_with_charts(dataset):
         ['Average Parameter 1 (Flowrate)', f"{dataset.avg_flowrate:.2f} m³/h"],
         ['Average Parameter 2 (Pressure)', f"{dataset.avg_pressure:.2f} bar"],
         ['Average Parameter 3 (Temperature)', f"{dataset.avg_temperature:.2f} °C"],
-        ['Parameter 1 Range', f"{equipment_stats['min_flowrate']:.2f} - {equipment_stats['max_flowrate']:.2f} m³/h"],
-        ['Parameter 2 Range', f"{equipment_stats['min_pressure']:.2f} - {equipment_stats['max_pressure']:.2f} bar"],
-        ['Parameter 3 Range', f"{equipment_stats['min_temperature']:.2f} - {equipment_stats['max_temperature']:.2f} °C"],
+        ['Parameter 1 Range', f"{equipment_stats['min_flowrate']:.2f} - {equipment_stats['max_flowrate']:.2f} m³/h" if equipment_stats['min_flowrate'] is not None else 'N/A'],
+        ['Parameter 2 Range', f"{equipment_stats['min_pressure']:.2f} - {equipment_stats['max_pressure']:.2f} bar" if equipment_stats['min_pressure'] is not None else 'N/A'],
+        ['Parameter 3 Range', f"{equipment_stats['min_temperature']:.2f} - {equipment_stats['max_temperature']:.2f} °C" if equipment_stats['min_temperature'] is not None else 'N/A'],
     ]
     
     overview_table = Table(overview_data, colWidths=[4*inch, 2.5*inch])
@@ -507,8 +1893,7 @@ def generate_pdf_report_with_charts(dataset):
     elements.append(overview_table)
     elements.append(Spacer(1, 0.25*inch))
     
-    type_dist = dataset.equipment.values('equipment_type').annotate(count=models.Count('id'))
-    type_distribution = {item['equipment_type']: item['count'] for item in type_dist}
+    type_distribution = statistics.type_distribution
     
     elements.append(Paragraph("Equipment Type Distribution", heading3_style))
     elements.append(Spacer(1, 0.1*inch))
@@ -536,7 +1921,7 @@ def generate_pdf_report_with_charts(dataset):
     elements.append(Paragraph("2. Data Visualizations", heading2_style))
     elements.append(Spacer(1, 0.15*inch))
     
-    chart_images = create_chart_images(dataset)
+    chart_images = create_chart_images(dataset, statistics)
     
     elements.append(Paragraph("2.1 Equipment Distribution Chart", heading3_style))
     elements.append(Spacer(1, 0.1*inch))
@@ -570,24 +1955,24 @@ def generate_pdf_report_with_charts(dataset):
         [
             'Flowrate',
             f"{dataset.avg_flowrate:.2f}",
-            f"{equipment_stats['min_flowrate']:.2f}",
-            f"{equipment_stats['max_flowrate']:.2f}",
+            f"{equipment_stats['min_flowrate']:.2f}" if equipment_stats['min_flowrate'] is not None else 'N/A',
+            f"{equipment_stats['max_flowrate']:.2f}" if equipment_stats['max_flowrate'] is not None else 'N/A',
             f"{equipment_stats['std_flowrate']:.2f}" if equipment_stats['std_flowrate'] else 'N/A',
             f"{equipment_stats['var_flowrate']:.2f}" if equipment_stats['var_flowrate'] else 'N/A'
         ],
         [
             'Pressure',
             f"{dataset.avg_pressure:.2f}",
-            f"{equipment_stats['min_pressure']:.2f}",
-            f"{equipment_stats['max_pressure']:.2f}",
+            f"{equipment_stats['min_pressure']:.2f}" if equipment_stats['min_pressure'] is not None else 'N/A',
+            f"{equipment_stats['max_pressure']:.2f}" if equipment_stats['max_pressure'] is not None else 'N/A',
             f"{equipment_stats['std_pressure']:.2f}" if equipment_stats['std_pressure'] else 'N/A',
             f"{equipment_stats['var_pressure']:.2f}" if equipment_stats['var_pressure'] else 'N/A'
         ],
         [
             'Temperature',
             f"{dataset.avg_temperature:.2f}",
-            f"{equipment_stats['min_temperature']:.2f}",
-            f"{equipment_stats['max_temperature']:.2f}",
+            f"{equipment_stats['min_temperature']:.2f}" if equipment_stats['min_temperature'] is not None else 'N/A',
+            f"{equipment_stats['max_temperature']:.2f}" if equipment_stats['max_temperature'] is not None else 'N/A',
             f"{equipment_stats['std_temperature']:.2f}" if equipment_stats['std_temperature'] else 'N/A',
             f"{equipment_stats['var_temperature']:.2f}" if equipment_stats['var_temperature'] else 'N/A'
         ],
@@ -612,13 +1997,9 @@ def generate_pdf_report_with_charts(dataset):
     elements.append(Paragraph("4. Quartile Distribution Analysis", heading2_style))
     elements.append(Spacer(1, 0.15*inch))
     
-    all_flowrates = [eq.flowrate for eq in dataset.equipment.all()]
-    all_pressures = [eq.pressure for eq in dataset.equipment.all()]
-    all_temperatures = [eq.temperature for eq in dataset.equipment.all()]
-    
-    flowrate_quartiles = calculate_quartiles(all_flowrates)
-    pressure_quartiles = calculate_quartiles(all_pressures)
-    temperature_quartiles = calculate_quartiles(all_temperatures)
+    flowrate_quartiles = statistics.parameters['flowrate']
+    pressure_quartiles = statistics.parameters['pressure']
+    temperature_quartiles = statistics.parameters['temperature']
     
     quartile_data = [
         ['Parameter', 'Q1 (25%)', 'Median (Q2)', 'Q3 (75%)', 'IQR'],
@@ -688,7 +2069,7 @@ def generate_pdf_report_with_charts(dataset):
     elements.append(Paragraph("5. Complete Equipment Data", heading2_style))
     elements.append(Spacer(1, 0.15*inch))
     
-    equipment_list = dataset.equipment.all()[:50]
+    equipment_list = dataset_equipment(dataset, 50)
     
     table_data = [['#', 'Equipment Name', 'Type', 'Param 1', 'Param 2', 'Param 3']]
     
@@ -697,9 +2078,9 @@ def generate_pdf_report_with_charts(dataset):
             str(idx),
             eq.equipment_name[:25],
             eq.equipment_type[:15],
-            f"{eq.flowrate:.2f}",
-            f"{eq.pressure:.2f}",
-            f"{eq.temperature:.2f}"
+            f"{eq.flowrate:.2f}" if eq.flowrate is not None else 'N/A',
+            f"{eq.pressure:.2f}" if eq.pressure is not None else 'N/A',
+            f"{eq.temperature:.2f}" if eq.temperature is not None else 'N/A'
         ])
     
     equipment_table = Table(table_data, colWidths=[0.4*inch, 2.2*inch, 1.5*inch, 0.9*inch, 0.9*inch, 0.9*inch])
@@ -727,18 +2108,16 @@ def generate_pdf_report_with_charts(dataset):
     elements.append(Paragraph("6. Operational Intelligence Dashboard", heading2_style))
     elements.append(Spacer(1, 0.15*inch))
     
-    all_equipment = dataset.equipment.all()
-    
     metrics_data = [['Parameter', 'Data Points', 'Efficiency', 'Status']]
     
-    for param_name, values in [
-        ('Parameter 1 (Flowrate)', all_flowrates),
-        ('Parameter 2 (Pressure)', all_pressures),
-        ('Parameter 3 (Temperature)', all_temperatures)
+    for param_name, stats in [
+        ('Parameter 1 (Flowrate)', statistics.parameters['flowrate']),
+        ('Parameter 2 (Pressure)', statistics.parameters['pressure']),
+        ('Parameter 3 (Temperature)', statistics.parameters['temperature'])
     ]:
-        if values:
-            avg = np.mean(values)
-            data_range = max(values) - min(values)
+        if stats:
+            avg = stats['mean']
+            data_range = stats['max'] - stats['min']
             relative_spread = data_range / abs(avg) if avg != 0 else 0
             
             if relative_spread < 0.5:
@@ -756,7 +2135,7 @@ def generate_pdf_report_with_charts(dataset):
             
             metrics_data.append([
                 param_name,
-                str(len(values)),
+                str(stats['count']),
                 efficiency,
                 status
             ])
@@ -6,19 +6,30 @@ from rest_framework.authtoken.models import Token
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.models import User
 from django.http import HttpResponse
-from django.db.models import Count, Max, Min, Avg, StdDev, Variance
 from django.core.mail import send_mail
 from django.conf import settings
+from django.core.files.storage import default_storage
 from django.utils.crypto import get_random_string
 from django.utils import timezone
 from datetime import timedelta
+from contextlib import nullcontext
 from google.oauth2 import id_token
 from google.auth.transport import requests as google_requests
-from .models import Dataset, Equipment, EmailVerification
-from .serializers import DatasetSerializer, DatasetListSerializer, UserSerializer
-from .utils import process_csv_file, save_equipment_data, generate_pdf_report_with_charts
+from config.db_routers import replica_reads, stick_to_primary
+from .models import Dataset, EmailVerification, IngestionJob, UploadSession
+from .serializers import DatasetSerializer, DatasetListSerializer, EquipmentSerializer, UserSerializer, IngestionJobSerializer
+from .admission import IngestionBusy, estimate_ingest_cost, ingestion_slot
+from .column_store import load_column, column_statistics
+from .packed_store import dataset_equipment_page
+from .utils import (
+    ingest_dataset, ingest_batch, extract_archive_members, is_supported_upload, UNSUPPORTED_FILE_MESSAGE, file_content_hash, find_duplicate_dataset,
+    reuse_duplicate_dataset, store_content_addressed, create_upload_session_file,
+    write_upload_session_chunk, store_upload_session_file, append_dataset_rows, dataset_statistics, delete_datasets,
+    generate_pdf_report_with_charts, json_safe
+)
 import re
 import json
+import zipfile
 import requests # MODIFIED: Added for Google Access Token verification
 
 
@@ -359,37 +370,66 @@ def upload_dataset(request):
     
     csv_file = request.FILES['file']
     
-    if not csv_file.name.endswith('.csv'):
-        return Response({'error': 'File must be a CSV'}, status=status.HTTP_400_BAD_REQUEST)
+    if not is_supported_upload(csv_file.name):
+        return Response({'error': UNSUPPORTED_FILE_MESSAGE}, status=status.HTTP_400_BAD_REQUEST)
     
-    success, result = process_csv_file(csv_file)
+    mode = request.data.get('mode')
+    streaming = mode == 'stream' or csv_file.size > settings.INGEST_STREAMING_THRESHOLD_BYTES
+    
+    if mode == 'async':
+        content_hash = file_content_hash(csv_file)
+        existing = find_duplicate_dataset(request.user, content_hash)
+        if existing:
+            return _upload_response(request, existing, reuse_duplicate_dataset(existing))
+        
+        stored_name, _ = store_content_addressed(csv_file, content_hash, csv_file.name)
+        return _queue_ingestion_job(request.user, stored_name, csv_file.name, csv_file.size, content_hash)
+    
+    try:
+        with ingestion_slot(estimate_ingest_cost(csv_file.size, csv_file.name, streaming)):
+            success, result, dataset = ingest_dataset(request.user, csv_file, csv_file.name, streaming=streaming)
+    except IngestionBusy as e:
+        return _busy_response(e)
     
     if not success:
         return Response({'error': result}, status=status.HTTP_400_BAD_REQUEST)
     
-    numeric_cols = result['column_summary']['numeric_columns']
-    
-    dataset = Dataset.objects.create(
-        name=csv_file.name,
-        uploaded_by=request.user,
-        file_path=csv_file,
-        total_equipment=result['total_equipment'],
-        avg_flowrate=0,
-        avg_pressure=0,
-        avg_temperature=0
+    return _upload_response(request, dataset, result)
+
+
+def _busy_response(error):
+    return Response(
+        {'error': 'Server is busy processing other uploads, please retry later', 'retry_after': error.retry_after},
+        status=status.HTTP_503_SERVICE_UNAVAILABLE,
+        headers={'Retry-After': str(error.retry_after)},
     )
+
+
+def _queue_ingestion_job(user, stored_name, file_name, file_size, content_hash):
+    job = IngestionJob.objects.create(
+        user=user,
+        file=stored_name,
+        file_name=file_name,
+        file_size=file_size,
+        content_hash=content_hash,
+    )
+    return Response({
+        'message': 'Upload accepted for processing',
+        'job_id': job.id,
+        'status': job.status,
+        'status_url': f'/api/jobs/{job.id}/',
+    }, status=status.HTTP_202_ACCEPTED)
+
+
+def _include_equipment(request):
+    # Rows are paged from /datasets/<id>/equipment/; ?include=equipment embeds them all
+    return 'equipment' in request.query_params.get('include', '').split(',')
+
+
+def _upload_response(request, dataset, result):
+    numeric_cols = result['column_summary']['numeric_columns']
     
-    save_equipment_data(dataset, result['equipment_list'], result['column_summary'])
-    
-    user_datasets = Dataset.objects.filter(uploaded_by=request.user).order_by('-uploaded_at')
-    if user_datasets.count() > 5:
-        datasets_to_delete = user_datasets[5:]
-        for ds in datasets_to_delete:
-            ds.delete()
-    
-    dataset.refresh_from_db()
-    
-    serializer = DatasetSerializer(dataset)
+    serializer = DatasetSerializer(dataset, context={'include_equipment': _include_equipment(request)})
     
     column_mapping = {
         'param1': numeric_cols[0] if len(numeric_cols) > 0 else 'Parameter 1',
@@ -402,14 +442,204 @@ def upload_dataset(request):
         'dataset': serializer.data,
         'column_summary': result['column_summary'],
         'column_mapping': column_mapping,
-        'averages': result['averages'],
-        'ranges': result['ranges']
+        # A parameter column with no numeric values has NaN figures
+        'averages': json_safe(result['averages']),
+        'ranges': json_safe(result['ranges']),
+        'duplicate': result.get('duplicate', False),
+        'column_memo_used': result.get('column_memo', {}).get('used', False),
+        'validation': dataset.validation_report,
     }
     
+    if response_data['duplicate']:
+        response_data['message'] = 'Identical file already uploaded; using the existing dataset'
+        return Response(response_data, status=status.HTTP_200_OK)
+    
+    return Response(response_data, status=status.HTTP_201_CREATED)
+
+def _upload_session_data(session):
+    return {
+        'upload_id': session.id,
+        'file_name': session.file_name,
+        'offset': session.received_bytes,
+        'total_size': session.total_size,
+        'status': session.status,
+        'dataset_id': session.dataset_id,
+    }
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def create_upload_session(request):
+    file_name = request.data.get('file_name', '')
+    
+    try:
+        total_size = int(request.data.get('total_size'))
+    except (TypeError, ValueError):
+        return Response({'error': 'total_size is required'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    if not is_supported_upload(file_name):
+        return Response({'error': UNSUPPORTED_FILE_MESSAGE}, status=status.HTTP_400_BAD_REQUEST)
+    
+    if total_size <= 0:
+        return Response({'error': 'total_size must be positive'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    session = UploadSession.objects.create(user=request.user, file_name=file_name, total_size=total_size)
+    create_upload_session_file(session)
+    
+    return Response(_upload_session_data(session), status=status.HTTP_201_CREATED)
+
+
+@api_view(['GET', 'PUT'])
+@permission_classes([IsAuthenticated])
+def upload_session_detail(request, upload_id):
+    try:
+        session = UploadSession.objects.get(id=upload_id, user=request.user)
+    except UploadSession.DoesNotExist:
+        return Response({'error': 'Upload not found'}, status=status.HTTP_404_NOT_FOUND)
+    
+    if request.method == 'GET':
+        return Response(_upload_session_data(session))
+    
+    if session.status != 'open':
+        data = _upload_session_data(session)
+        data['error'] = 'Upload already finalized'
+        return Response(data, status=status.HTTP_409_CONFLICT)
+    
+    match = re.match(r'^bytes (\d+)-(\d+)/(\d+)$', request.headers.get('Content-Range', ''))
+    if not match:
+        return Response({'error': 'Content-Range header required (bytes start-end/total)'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    start, end, total = (int(value) for value in match.groups())
+    if total != session.total_size or end < start or end >= total:
+        return Response({'error': 'Invalid Content-Range'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    if start != session.received_bytes:
+        data = _upload_session_data(session)
+        data['error'] = 'Chunk does not start at the acknowledged offset'
+        return Response(data, status=status.HTTP_409_CONFLICT)
+    
+    written = write_upload_session_chunk(session, start, request.stream, end - start + 1)
+    UploadSession.objects.filter(id=session.id, received_bytes=start).update(
+        received_bytes=start + written,
+        updated_at=timezone.now(),
+    )
+    session.refresh_from_db()
+    
+    return Response(_upload_session_data(session))
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def finalize_upload_session(request, upload_id):
+    try:
+        session = UploadSession.objects.get(id=upload_id, user=request.user)
+    except UploadSession.DoesNotExist:
+        return Response({'error': 'Upload not found'}, status=status.HTTP_404_NOT_FOUND)
+    
+    if session.status != 'open':
+        data = _upload_session_data(session)
+        data['error'] = 'Upload already finalized'
+        return Response(data, status=status.HTTP_409_CONFLICT)
+    
+    if session.received_bytes != session.total_size:
+        data = _upload_session_data(session)
+        data['error'] = 'Upload incomplete'
+        return Response(data, status=status.HTTP_409_CONFLICT)
+    
+    is_async = request.data.get('mode') == 'async'
+    streaming = session.total_size > settings.INGEST_STREAMING_THRESHOLD_BYTES
+    
+    # Admission is checked before the session is finalized so a 503 leaves
+    # the upload open for the client to finalize again later.
+    if is_async:
+        slot = nullcontext()
+    else:
+        slot = ingestion_slot(estimate_ingest_cost(session.total_size, session.file_name, streaming))
+    
+    try:
+        with slot:
+            return _complete_upload_session(request, session, is_async, streaming)
+    except IngestionBusy as e:
+        return _busy_response(e)
+
+
+def _complete_upload_session(request, session, is_async, streaming):
+    stored_name, content_hash = store_upload_session_file(session)
+    session.status = 'finalized'
+    session.save(update_fields=['status'])
+    
+    if is_async:
+        existing = find_duplicate_dataset(request.user, content_hash)
+        if existing:
+            return _upload_response(request, existing, reuse_duplicate_dataset(existing))
+        return _queue_ingestion_job(request.user, stored_name, session.file_name, session.total_size, content_hash)
+    
+    with default_storage.open(stored_name, 'rb') as data_file:
+        success, result, dataset = ingest_dataset(
+            request.user,
+            data_file,
+            session.file_name,
+            streaming=streaming,
+            content_hash=content_hash,
+            stored_name=stored_name,
+        )
+    
+    if not success:
+        return Response({'error': result}, status=status.HTTP_400_BAD_REQUEST)
+    
+    session.dataset = dataset
+    session.save(update_fields=['dataset'])
+    
+    return _upload_response(request, dataset, result)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def upload_batch(request):
+    uploads = request.FILES.getlist('files')
+    
+    if not uploads:
+        return Response({'error': 'No files provided'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    payloads = []
+    results = []
+    for upload in uploads:
+        if upload.name.lower().endswith('.zip'):
+            try:
+                payloads.extend(extract_archive_members(upload))
+            except zipfile.BadZipFile:
+                results.append({'file': upload.name, 'success': False, 'error': 'Invalid zip archive'})
+        elif is_supported_upload(upload.name):
+            payloads.append((upload.name, upload.read()))
+        else:
+            results.append({'file': upload.name, 'success': False, 'error': f'{UNSUPPORTED_FILE_MESSAGE} or zip archive'})
+    
+    if len(payloads) > settings.BATCH_UPLOAD_MAX_FILES:
+        return Response({'error': f'Too many files (maximum {settings.BATCH_UPLOAD_MAX_FILES})'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    if payloads:
+        cost = sum(estimate_ingest_cost(len(payload), name) for name, payload in payloads)
+        try:
+            with ingestion_slot(cost):
+                results = ingest_batch(request.user, payloads) + results
+        except IngestionBusy as e:
+            return _busy_response(e)
+    
+    succeeded = sum(1 for item in results if item['success'])
+    response_data = {
+        'message': f'{succeeded} of {len(results)} files uploaded successfully',
+        'results': results,
+    }
+    
+    if not succeeded:
+        response_data['error'] = 'No files could be processed'
+        return Response(response_data, status=status.HTTP_400_BAD_REQUEST)
+    
     return Response(response_data, status=status.HTTP_201_CREATED)
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@replica_reads
 def list_datasets(request):
     datasets = Dataset.objects.filter(uploaded_by=request.user)[:5]
     serializer = DatasetListSerializer(datasets, many=True)
@@ -418,54 +648,46 @@ def list_datasets(request):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@replica_reads
 def dataset_detail(request, dataset_id):
     try:
         dataset = Dataset.objects.get(id=dataset_id, uploaded_by=request.user)
     except Dataset.DoesNotExist:
         return Response({'error': 'Dataset not found'}, status=status.HTTP_404_NOT_FOUND)
     
-    serializer = DatasetSerializer(dataset)
-    type_dist = dataset.equipment.values('equipment_type').annotate(count=Count('id'))
-    type_distribution = {item['equipment_type']: item['count'] for item in type_dist}
+    serializer = DatasetSerializer(dataset, context={'include_equipment': _include_equipment(request)})
     
     response_data = serializer.data
-    response_data['type_distribution'] = type_distribution
+    response_data['type_distribution'] = dataset_statistics(dataset).type_distribution
     
     return Response(response_data)
 
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@replica_reads
 def dataset_summary(request, dataset_id):
     try:
         dataset = Dataset.objects.get(id=dataset_id, uploaded_by=request.user)
     except Dataset.DoesNotExist:
         return Response({'error': 'Dataset not found'}, status=status.HTTP_404_NOT_FOUND)
     
-    type_dist = dataset.equipment.values('equipment_type').annotate(count=Count('id'))
-    type_distribution = {item['equipment_type']: item['count'] for item in type_dist}
-    
-    equipment_stats = dataset.equipment.aggregate(
-        max_flowrate=Max('flowrate'),
-        min_flowrate=Min('flowrate'),
-        std_flowrate=StdDev('flowrate'),
-        var_flowrate=Variance('flowrate'),
-        max_pressure=Max('pressure'),
-        min_pressure=Min('pressure'),
-        std_pressure=StdDev('pressure'),
-        var_pressure=Variance('pressure'),
-        max_temperature=Max('temperature'),
-        min_temperature=Min('temperature'),
-        std_temperature=StdDev('temperature'),
-        var_temperature=Variance('temperature'),
-    )
+    statistics = dataset_statistics(dataset)
+    type_distribution = statistics.type_distribution
     
     total = dataset.total_equipment
     type_percentages = {eq_type: round((count / total) * 100, 2) for eq_type, count in type_distribution.items()}
     
-    cv_flowrate = (equipment_stats['std_flowrate'] / dataset.avg_flowrate * 100) if dataset.avg_flowrate else 0
-    cv_pressure = (equipment_stats['std_pressure'] / dataset.avg_pressure * 100) if dataset.avg_pressure else 0
-    cv_temperature = (equipment_stats['std_temperature'] / dataset.avg_temperature * 100) if dataset.avg_temperature else 0
+    ranges = {}
+    for field, stats in statistics.parameters.items():
+        stats = stats or {}
+        ranges[field] = {
+            'min': stats.get('min'),
+            'max': stats.get('max'),
+            'std': round(stats.get('std') or 0, 2),
+            'var': round(stats.get('var') or 0, 2),
+            'cv': round(stats.get('cv') or 0, 2),
+        }
     
     summary = {
         'id': dataset.id,
@@ -477,31 +699,13 @@ def dataset_summary(request, dataset_id):
             'pressure': dataset.avg_pressure,
             'temperature': dataset.avg_temperature,
         },
-        'ranges': {
-            'flowrate': {
-                'min': equipment_stats['min_flowrate'],
-                'max': equipment_stats['max_flowrate'],
-                'std': round(equipment_stats['std_flowrate'] or 0, 2),
-                'var': round(equipment_stats['var_flowrate'] or 0, 2),
-                'cv': round(cv_flowrate, 2),
-            },
-            'pressure': {
-                'min': equipment_stats['min_pressure'],
-                'max': equipment_stats['max_pressure'],
-                'std': round(equipment_stats['std_pressure'] or 0, 2),
-                'var': round(equipment_stats['var_pressure'] or 0, 2),
-                'cv': round(cv_pressure, 2),
-            },
-            'temperature': {
-                'min': equipment_stats['min_temperature'],
-                'max': equipment_stats['max_temperature'],
-                'std': round(equipment_stats['std_temperature'] or 0, 2),
-                'var': round(equipment_stats['var_temperature'] or 0, 2),
-                'cv': round(cv_temperature, 2),
-            },
-        },
+        'ranges': ranges,
+        # Full per-parameter figures; quartiles are absent after an append
+        # until the next report recomputes them
+        'statistics': statistics.parameters,
         'type_distribution': type_distribution,
         'type_percentages': type_percentages,
+        'validation': dataset.validation_report,
     }
     
     return Response(summary)
@@ -509,6 +713,7 @@ def dataset_summary(request, dataset_id):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@replica_reads
 def generate_report(request, dataset_id):
     try:
         dataset = Dataset.objects.get(id=dataset_id, uploaded_by=request.user)
@@ -523,12 +728,136 @@ def generate_report(request, dataset_id):
     return response
 
 
-@api_view(['DELETE'])
+@api_view(['GET'])
 @permission_classes([IsAuthenticated])
-def delete_dataset(request, dataset_id):
+@replica_reads
+def dataset_columns(request, dataset_id):
     try:
         dataset = Dataset.objects.get(id=dataset_id, uploaded_by=request.user)
-        dataset.delete()
-        return Response({'message': 'Dataset deleted successfully'}, status=status.HTTP_200_OK)
     except Dataset.DoesNotExist:
-        return Response({'error': 'Dataset not found'}, status=status.HTTP_404_NOT_FOUND)
\ No newline at end of file
+        return Response({'error': 'Dataset not found'}, status=status.HTTP_404_NOT_FOUND)
+    
+    column = request.query_params.get('column')
+    if not column:
+        columns = []
+        for name in dataset.column_store:
+            stats = column_statistics(load_column(dataset, name))
+            stats['name'] = name
+            columns.append(stats)
+        return Response({'dataset_id': dataset.id, 'columns': columns})
+    
+    values = load_column(dataset, column)
+    if values is None:
+        return Response({'error': 'Column not found'}, status=status.HTTP_404_NOT_FOUND)
+    
+    try:
+        offset = max(int(request.query_params.get('offset', 0)), 0)
+        limit = min(max(int(request.query_params.get('limit', 1000)), 1), 10000)
+    except ValueError:
+        return Response({'error': 'offset and limit must be integers'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    window = values[offset:offset + limit]
+    return Response({
+        'dataset_id': dataset.id,
+        'column': column,
+        'total': len(values),
+        'offset': offset,
+        'values': [None if value != value else value for value in window.tolist()],
+    })
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@replica_reads
+def dataset_equipment_list(request, dataset_id):
+    try:
+        dataset = Dataset.objects.get(id=dataset_id, uploaded_by=request.user)
+    except Dataset.DoesNotExist:
+        return Response({'error': 'Dataset not found'}, status=status.HTTP_404_NOT_FOUND)
+    
+    try:
+        after = max(int(request.query_params.get('after', 0)), 0)
+        limit = min(max(int(request.query_params.get('limit', settings.EQUIPMENT_PAGE_SIZE)), 1), settings.EQUIPMENT_PAGE_MAX)
+    except ValueError:
+        return Response({'error': 'after and limit must be integers'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    # One extra row tells whether another page follows
+    equipment = dataset_equipment_page(dataset, after, limit + 1)
+    next_cursor = equipment[limit - 1].id if len(equipment) > limit else None
+    
+    return Response({
+        'dataset_id': dataset.id,
+        'total': dataset.total_equipment,
+        'results': EquipmentSerializer(equipment[:limit], many=True).data,
+        'next_cursor': next_cursor,
+        'next': f'/api/datasets/{dataset.id}/equipment/?after={next_cursor}&limit={limit}' if next_cursor is not None else None,
+    })
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def append_dataset(request, dataset_id):
+    try:
+        dataset = Dataset.objects.get(id=dataset_id, uploaded_by=request.user)
+    except Dataset.DoesNotExist:
+        return Response({'error': 'Dataset not found'}, status=status.HTTP_404_NOT_FOUND)
+    
+    data_file = request.FILES.get('file')
+    rows = None if data_file else request.data.get('rows')
+    
+    if data_file:
+        if not is_supported_upload(data_file.name):
+            return Response({'error': UNSUPPORTED_FILE_MESSAGE}, status=status.HTTP_400_BAD_REQUEST)
+        cost = estimate_ingest_cost(data_file.size, data_file.name)
+    elif isinstance(rows, list) and rows:
+        cost = estimate_ingest_cost(len(json.dumps(rows)), 'rows.csv')
+    else:
+        return Response({'error': 'Provide a file or a non-empty list of rows'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    try:
+        with ingestion_slot(cost):
+            success, result = append_dataset_rows(
+                dataset,
+                data_file=data_file,
+                name=data_file.name if data_file else None,
+                rows=rows,
+            )
+    except IngestionBusy as e:
+        return _busy_response(e)
+    
+    if not success:
+        return Response({'error': result}, status=status.HTTP_400_BAD_REQUEST)
+    
+    return Response({
+        'message': f"{result['appended']} rows appended",
+        'appended': result['appended'],
+        'total_equipment': result['total_equipment'],
+        'averages': result['averages'],
+        'ranges': result['ranges'],
+        'type_distribution': result['type_distribution'],
+        'validation': result['validation'],
+    }, status=status.HTTP_200_OK)
+
+
+@api_view(['DELETE'])
+@permission_classes([IsAuthenticated])
+def delete_dataset(request, dataset_id):
+    if not delete_datasets(Dataset.objects.filter(id=dataset_id, uploaded_by=request.user)):
+        return Response({'error': 'Dataset not found'}, status=status.HTTP_404_NOT_FOUND)
+    return Response({'message': 'Dataset deleted successfully'}, status=status.HTTP_200_OK)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def job_status(request, job_id):
+    try:
+        job = IngestionJob.objects.get(id=job_id, user=request.user)
+    except IngestionJob.DoesNotExist:
+        return Response({'error': 'Job not found'}, status=status.HTTP_404_NOT_FOUND)
+    
+    serializer = IngestionJobSerializer(job)
+    response = Response(serializer.data)
+    if job.status == 'succeeded':
+        # The worker's writes count as the client's own for the dataset reads that follow
+        stick_to_primary(response)
+    return response
\ No newline at end of file
@@ -0,0 +1,72 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+
+
+# Optional read replica (REPLICA_DATABASE_URL). Reads go to the replica only
+# inside views wrapped with replica_reads; everything else, and every write,
+# uses 'default'. After a client writes, a short-lived cookie keeps its reads
+# on the primary until the replica has had time to catch up.
+REPLICA_DATABASE = 'replica'
+STICKY_COOKIE = 'db_primary'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+read_database = ContextVar('read_database', default=None)
+
+
+def replica_configured():
+    return REPLICA_DATABASE in settings.DATABASES
+
+
+@contextmanager
+def reads_from(alias):
+    token = read_database.set(alias)
+    try:
+        yield
+    finally:
+        read_database.reset(token)
+
+
+def stick_to_primary(response):
+    response.set_cookie(STICKY_COOKIE, '1', max_age=settings.REPLICA_STICKY_SECONDS, httponly=True, samesite='Lax')
+    return response
+
+
+def replica_reads(view):
+    # Innermost decorator of a read-only view, so authentication still reads
+    # the primary: a token created moments ago may not have replicated yet.
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if not replica_configured() or request.method not in SAFE_METHODS or STICKY_COOKIE in request.COOKIES:
+            return view(request, *args, **kwargs)
+        with reads_from(REPLICA_DATABASE):
+            return view(request, *args, **kwargs)
+    return wrapper
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        return read_database.get()
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica holds the same rows as the primary
+        databases = {'default', REPLICA_DATABASE}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+
+class ReadYourWritesMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if replica_configured() and request.method not in SAFE_METHODS and response.status_code < 400:
+            stick_to_primary(response)
+        return response
@@ -1,4 +1,5 @@
 from pathlib import Path
+import json
 import os
 from dotenv import load_dotenv
 import dj_database_url
@@ -41,6 +42,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'config.db_routers.ReadYourWritesMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -74,6 +76,26 @@ DATABASES = {
     )
 }
 
+# Applied to every SQLite connection (see api/signals.py): WAL journal so
+# readers no longer wait on a writer, synchronous=NORMAL (safe with WAL),
+# memory-mapped reads, a larger page cache, BEGIN IMMEDIATE transactions and a
+# longer wait on a busy database before "database is locked". Ignored for other databases.
+SQLITE_TUNING = os.getenv('SQLITE_TUNING', 'True') == 'True'
+SQLITE_MMAP_SIZE = int(os.getenv('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))
+SQLITE_CACHE_SIZE_KB = int(os.getenv('SQLITE_CACHE_SIZE_KB', 64 * 1024))
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', 20000))
+
+# Optional read replica: the read-only dataset endpoints (list, detail,
+# summary, report, columns) query it, except for REPLICA_STICKY_SECONDS after
+# the client's own last write, when they read the primary (see config/db_routers.py).
+REPLICA_DATABASE_URL = os.getenv('REPLICA_DATABASE_URL', '')
+REPLICA_STICKY_SECONDS = int(os.getenv('REPLICA_STICKY_SECONDS', 30))
+if REPLICA_DATABASE_URL:
+    DATABASES['replica'] = dj_database_url.parse(REPLICA_DATABASE_URL, conn_max_age=600)
+    # Test runs read the test copy of default instead of a separate database
+    DATABASES['replica']['TEST'] = {'MIRROR': 'default'}
+DATABASE_ROUTERS = ['config.db_routers.ReplicaRouter']
+
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
     {'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator'},
@@ -97,6 +119,13 @@ else:
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Same limits as Django's defaults, but each upload also gets a SHA-256
+# content_hash computed while the request body is read (see api.upload_handlers).
+FILE_UPLOAD_HANDLERS = [
+    'api.upload_handlers.HashingMemoryFileUploadHandler',
+    'api.upload_handlers.HashingTemporaryFileUploadHandler',
+]
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
@@ -160,4 +189,77 @@ GOOGLE_OAUTH_CLIENT_ID = os.getenv('GOOGLE_OAUTH_CLIENT_ID', '')
 GOOGLE_OAUTH_CLIENT_SECRET = os.getenv('GOOGLE_OAUTH_CLIENT_SECRET', '')
 GOOGLE_OAUTH_REDIRECT_URI = os.getenv('GOOGLE_OAUTH_REDIRECT_URI', 'http://localhost:5000/auth/google/callback')
 
-EMAIL_VERIFICATION_TIMEOUT_MINUTES = int(os.getenv('EMAIL_VERIFICATION_TIMEOUT_MINUTES', 10))
\ No newline at end of file
+EMAIL_VERIFICATION_TIMEOUT_MINUTES = int(os.getenv('EMAIL_VERIFICATION_TIMEOUT_MINUTES', 10))
+
+# CSV ingestion
+# Uploads larger than INGEST_STREAMING_THRESHOLD_BYTES are parsed in chunks of
+# INGEST_CHUNK_SIZE rows so peak memory is bounded by the chunk, not the file.
+INGEST_CHUNK_SIZE = int(os.getenv('INGEST_CHUNK_SIZE', 50000))
+INGEST_STREAMING_THRESHOLD_BYTES = int(os.getenv('INGEST_STREAMING_THRESHOLD_BYTES', 50 * 1024 * 1024))
+
+# Column role detection looks at the first N rows plus N randomly sampled rows
+# and only scans the full column when the sample is ambiguous. 0 disables sampling.
+COLUMN_DETECTION_SAMPLE_SIZE = int(os.getenv('COLUMN_DETECTION_SAMPLE_SIZE', 1000))
+
+# pandas read_csv engine for whole-file parses: 'c' (default), 'pyarrow'
+# (multithreaded, needs pyarrow) or 'python'. Chunked parses always use 'c'.
+# Column roles are detected on the first CSV_DETECTION_PREFIX_BYTES of the file.
+CSV_PARSE_ENGINE = os.getenv('CSV_PARSE_ENGINE', 'c')
+CSV_DETECTION_PREFIX_BYTES = int(os.getenv('CSV_DETECTION_PREFIX_BYTES', 1024 * 1024))
+
+# Equipment rows are bulk loaded with COPY FROM STDIN on PostgreSQL and batched
+# executemany elsewhere ('auto'); 'copy', 'executemany' or 'orm' force a backend.
+BULK_LOAD_BACKEND = os.getenv('BULK_LOAD_BACKEND', 'auto')
+BULK_LOAD_BATCH_SIZE = int(os.getenv('BULK_LOAD_BATCH_SIZE', 10000))
+
+# Equipment storage: 'rows' (one Equipment row per record), 'packed' (per-dataset
+# zlib-compressed arrays, PACKED_BLOCK_ROWS records per block) or 'auto': packed
+# for streamed uploads and files of at least PACKED_STORAGE_MIN_ROWS rows. Packed
+# storage is opt-in: the default keeps every dataset in Equipment rows.
+EQUIPMENT_STORAGE_MODE = os.getenv('EQUIPMENT_STORAGE_MODE', 'rows')
+PACKED_STORAGE_MIN_ROWS = int(os.getenv('PACKED_STORAGE_MIN_ROWS', 1000000))
+PACKED_BLOCK_ROWS = int(os.getenv('PACKED_BLOCK_ROWS', 100000))
+PACKED_COMPRESSION_LEVEL = int(os.getenv('PACKED_COMPRESSION_LEVEL', 1))
+
+# Admission control: each ingestion reserves an estimated peak memory of
+# upload size x INGEST_MEMORY_FACTOR (compressed uploads are first scaled by
+# INGEST_COMPRESSION_RATIO_ESTIMATE). Requests beyond the budget or the
+# concurrency limit get 503 with Retry-After; a lone ingestion is always admitted.
+INGEST_ADMISSION_CONTROL = os.getenv('INGEST_ADMISSION_CONTROL', 'True') == 'True'
+INGEST_MEMORY_BUDGET_BYTES = int(os.getenv('INGEST_MEMORY_BUDGET_BYTES', 2 * 1024 * 1024 * 1024))
+INGEST_MAX_CONCURRENT = int(os.getenv('INGEST_MAX_CONCURRENT', 4))
+INGEST_MEMORY_FACTOR = float(os.getenv('INGEST_MEMORY_FACTOR', 4))
+INGEST_COMPRESSION_RATIO_ESTIMATE = float(os.getenv('INGEST_COMPRESSION_RATIO_ESTIMATE', 10))
+INGEST_RETRY_AFTER_SECONDS = int(os.getenv('INGEST_RETRY_AFTER_SECONDS', 30))
+INGEST_LEASE_SECONDS = int(os.getenv('INGEST_LEASE_SECONDS', 3600))
+
+# GET /api/datasets/<id>/equipment/ page size (?limit=) and its upper bound
+EQUIPMENT_PAGE_SIZE = int(os.getenv('EQUIPMENT_PAGE_SIZE', 1000))
+EQUIPMENT_PAGE_MAX = int(os.getenv('EQUIPMENT_PAGE_MAX', 10000))
+
+# Validation report: numeric cells outside these bounds (keyed by lower-cased
+# column name, null for open-ended) are counted as out of range; infinities
+# always are. Up to VALIDATION_SAMPLE_ROWS offending row indices are kept per check.
+VALIDATION_RANGES = json.loads(os.getenv('VALIDATION_RANGES', '{"flowrate": [0, null], "temperature": [-273.15, null]}'))
+VALIDATION_SAMPLE_ROWS = int(os.getenv('VALIDATION_SAMPLE_ROWS', 10))
+
+# PostgreSQL only: LIST-partition api_equipment by dataset when migrations run
+# (or later with manage.py partition_equipment), see api/partitioning.py
+EQUIPMENT_PARTITIONING = os.getenv('EQUIPMENT_PARTITIONING', 'False') == 'True'
+
+# Datasets removed by retention or DELETE are hidden at once and purged (rows,
+# column store, uploaded file) by a background thread of the web process; with
+# DATASET_PURGE_THREAD=False only run_ingest_worker purges them.
+DATASET_PURGE_THREAD = os.getenv('DATASET_PURGE_THREAD', 'True') == 'True'
+DATASET_PURGE_BATCH_ROWS = int(os.getenv('DATASET_PURGE_BATCH_ROWS', 50000))
+
+# Background ingestion worker (python manage.py run_ingest_worker)
+INGEST_WORKER_POLL_SECONDS = float(os.getenv('INGEST_WORKER_POLL_SECONDS', 2))
+INGEST_JOB_STALE_SECONDS = int(os.getenv('INGEST_JOB_STALE_SECONDS', 1800))
+
+# Batch uploads (POST /api/upload/batch/) are parsed across a process pool
+INGEST_BATCH_WORKERS = int(os.getenv('INGEST_BATCH_WORKERS', min(4, os.cpu_count() or 1)))
+BATCH_UPLOAD_MAX_FILES = int(os.getenv('BATCH_UPLOAD_MAX_FILES', 100))
+
+# Resumable uploads (/api/uploads/) that see no new bytes for this long are discarded by the worker
+UPLOAD_SESSION_EXPIRY_HOURS = int(os.getenv('UPLOAD_SESSION_EXPIRY_HOURS', 24))
\ No newline at end of file
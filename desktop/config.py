@@ -4,6 +4,15 @@ APP_NAME = "Chemical Equipment Visualizer"
 APP_VERSION = "1.0.0"
 API_BASE_URL = os.getenv('API_BASE_URL', 'http://localhost:8000/api')
 
+# Files at least this large are sent through the resumable chunked upload API
+RESUMABLE_UPLOAD_THRESHOLD = int(os.getenv('RESUMABLE_UPLOAD_THRESHOLD', 20 * 1024 * 1024))
+UPLOAD_CHUNK_SIZE = int(os.getenv('UPLOAD_CHUNK_SIZE', 4 * 1024 * 1024))
+UPLOAD_MAX_RETRIES = int(os.getenv('UPLOAD_MAX_RETRIES', 5))
+# Plain .csv files are gzipped before upload (the server decompresses as it parses)
+COMPRESS_UPLOADS = os.getenv('COMPRESS_UPLOADS', 'True') == 'True'
+# Rows requested per page from /datasets/<id>/equipment/
+EQUIPMENT_PAGE_SIZE = int(os.getenv('EQUIPMENT_PAGE_SIZE', 5000))
+
 COLORS = {
     'primary': '#667eea',
     'success': '#11998e',
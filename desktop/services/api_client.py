@@ -1,3 +1,11 @@
+import gzip
+import hashlib
+import os
+import shutil
+import tempfile
+import time
+from contextlib import ExitStack
+
 import requests
 
 class APIClient:
@@ -7,6 +15,7 @@ class APIClient:
         self.session = requests.Session()
         self.csrf_token = None
         self.token = None
+        self.upload_sessions = {}
     
     def _get_csrf(self):
         csrf = self.session.cookies.get('csrftoken')
@@ -75,18 +84,177 @@ class APIClient:
         except Exception as e:
             return False, str(e)
     
-    def upload_dataset(self, file_path):
+    def _compressed_copy(self, file_path):
+        # Named after the source path, size and mtime so a retried upload reuses
+        # the same bytes (and the same resumable session); mtime=0 keeps the
+        # gzip output identical for identical input so the server can dedupe it.
+        stat = os.stat(file_path)
+        key = '{}:{}:{}'.format(os.path.abspath(file_path), stat.st_size, stat.st_mtime)
+        gz_path = os.path.join(tempfile.gettempdir(), 'upload-{}.csv.gz'.format(hashlib.sha1(key.encode()).hexdigest()))
+        
+        if not os.path.exists(gz_path):
+            partial_path = gz_path + '.tmp'
+            with open(file_path, 'rb') as src, open(partial_path, 'wb') as dst:
+                with gzip.GzipFile(filename='', mode='wb', fileobj=dst, mtime=0) as gz:
+                    shutil.copyfileobj(src, gz, 1024 * 1024)
+            os.replace(partial_path, gz_path)
+        return gz_path
+    
+    def upload_dataset(self, file_path, compress=None):
+        from config import RESUMABLE_UPLOAD_THRESHOLD, COMPRESS_UPLOADS
+        if compress is None:
+            compress = COMPRESS_UPLOADS and file_path.lower().endswith('.csv')
+        
+        file_name = os.path.basename(file_path)
+        send_path = file_path
+        if compress:
+            try:
+                send_path = self._compressed_copy(file_path)
+                file_name += '.gz'
+            except OSError as e:
+                print(f"⚠️ Could not compress {file_name}, sending uncompressed: {str(e)}")
+        
+        resumable = os.path.getsize(send_path) >= RESUMABLE_UPLOAD_THRESHOLD
+        if resumable:
+            success, result = self.upload_dataset_resumable(send_path, file_name=file_name)
+        else:
+            try:
+                self._get_csrf()
+                with open(send_path, 'rb') as f:
+                    files = {'file': (file_name, f)}
+                    headers = {'X-CSRFToken': self.csrf_token} if self.csrf_token else {}
+                    r = self.session.post('{}/upload/'.format(self.base_url), 
+                                         files=files, headers=headers)
+                success, result = self._handle_response(r)
+            except Exception as e:
+                success, result = False, str(e)
+        
+        # A failed resumable upload keeps the compressed copy so a retry can resume
+        if send_path != file_path and (success or not resumable):
+            try:
+                os.remove(send_path)
+            except OSError:
+                pass
+        return success, result
+    
+    def _upload_offset(self, upload_url):
+        r = self.session.get(upload_url)
+        if r.status_code != 200:
+            return None
+        return r.json()['offset']
+    
+    def _finalized_upload(self, key, session_data):
+        # The server already finalized this upload (e.g. an earlier finalize
+        # succeeded but its response was lost): report the existing dataset.
+        self.upload_sessions.pop(key, None)
+        dataset_id = session_data.get('dataset_id')
+        if not dataset_id:
+            return False, 'Upload already finalized; its dataset is not available yet'
+        success, dataset = self.get_dataset_detail(dataset_id)
+        if not success:
+            return success, dataset
+        return True, {'message': 'Upload already finalized', 'dataset': dataset, 'dataset_id': dataset_id}
+    
+    def upload_dataset_resumable(self, file_path, chunk_size=None, file_name=None):
+        from config import UPLOAD_CHUNK_SIZE, UPLOAD_MAX_RETRIES
+        chunk_size = chunk_size or UPLOAD_CHUNK_SIZE
+        
         try:
             self._get_csrf()
+            total_size = os.path.getsize(file_path)
+            # Keyed on path, size and mtime so an edited file starts a fresh upload
+            key = (os.path.abspath(file_path), total_size, os.path.getmtime(file_path))
+            
+            upload_id = self.upload_sessions.get(key)
+            offset = None
+            if upload_id:
+                offset = self._upload_offset('{}/uploads/{}/'.format(self.base_url, upload_id))
+            
+            if offset is None:
+                r = self.session.post('{}/uploads/'.format(self.base_url),
+                                     json={'file_name': file_name or os.path.basename(file_path), 'total_size': total_size})
+                success, result = self._handle_response(r)
+                if not success:
+                    return success, result
+                upload_id = result['upload_id']
+                offset = result['offset']
+                self.upload_sessions[key] = upload_id
+            
+            upload_url = '{}/uploads/{}/'.format(self.base_url, upload_id)
+            retries = 0
+            
             with open(file_path, 'rb') as f:
-                files = {'file': f}
+                while offset < total_size:
+                    f.seek(offset)
+                    chunk = f.read(chunk_size)
+                    headers = {
+                        'Content-Range': 'bytes {}-{}/{}'.format(offset, offset + len(chunk) - 1, total_size),
+                        'Content-Type': 'application/octet-stream',
+                    }
+                    
+                    try:
+                        r = self.session.put(upload_url, data=chunk, headers=headers)
+                    except requests.RequestException as e:
+                        retries += 1
+                        if retries > UPLOAD_MAX_RETRIES:
+                            return False, 'Upload interrupted: {}'.format(str(e))
+                        print(f"⚠️ Upload interrupted at byte {offset}, retrying ({retries}/{UPLOAD_MAX_RETRIES})")
+                        time.sleep(min(2 ** retries, 30))
+                        try:
+                            acknowledged = self._upload_offset(upload_url)
+                            if acknowledged is not None:
+                                offset = acknowledged
+                        except requests.RequestException:
+                            pass
+                        continue
+                    
+                    if r.status_code not in [200, 409]:
+                        return self._handle_response(r)
+                    
+                    data = r.json()
+                    if data.get('status', 'open') != 'open':
+                        return self._finalized_upload(key, data)
+                    offset = data['offset']
+                    retries = 0
+            
+            r = self.session.post('{}finalize/'.format(upload_url))
+            if r.status_code == 409 and r.json().get('status', 'open') != 'open':
+                return self._finalized_upload(key, r.json())
+            success, result = self._handle_response(r)
+            if success:
+                self.upload_sessions.pop(key, None)
+            return success, result
+        except Exception as e:
+            return False, str(e)
+    
+    def upload_many(self, file_paths):
+        try:
+            self._get_csrf()
+            with ExitStack() as stack:
+                files = [
+                    ('files', (os.path.basename(path), stack.enter_context(open(path, 'rb'))))
+                    for path in file_paths
+                ]
                 headers = {'X-CSRFToken': self.csrf_token} if self.csrf_token else {}
-                r = self.session.post('{}/upload/'.format(self.base_url), 
+                r = self.session.post('{}/upload/batch/'.format(self.base_url),
                                      files=files, headers=headers)
             return self._handle_response(r)
         except Exception as e:
             return False, str(e)
     
+    def append_rows(self, dataset_id, file_path=None, rows=None):
+        try:
+            self._get_csrf()
+            url = '{}/datasets/{}/append/'.format(self.base_url, dataset_id)
+            if file_path:
+                with open(file_path, 'rb') as f:
+                    r = self.session.post(url, files={'file': f})
+            else:
+                r = self.session.post(url, json={'rows': rows})
+            return self._handle_response(r)
+        except Exception as e:
+            return False, str(e)
+    
     def get_datasets(self):
         try:
             r = self.session.get('{}/datasets/'.format(self.base_url))
@@ -101,6 +269,28 @@ class APIClient:
         except Exception as e:
             return False, str(e)
     
+    def get_dataset_equipment(self, dataset_id, max_rows=None):
+        # Follows the keyset pages of /datasets/<id>/equipment/ until max_rows
+        # rows (or every row) have been fetched
+        from config import EQUIPMENT_PAGE_SIZE
+        try:
+            equipment = []
+            after = 0
+            while max_rows is None or len(equipment) < max_rows:
+                limit = EQUIPMENT_PAGE_SIZE if max_rows is None else min(EQUIPMENT_PAGE_SIZE, max_rows - len(equipment))
+                r = self.session.get('{}/datasets/{}/equipment/'.format(self.base_url, dataset_id),
+                                     params={'after': after, 'limit': limit})
+                success, page = self._handle_response(r)
+                if not success:
+                    return success, page
+                equipment.extend(page['results'])
+                after = page['next_cursor']
+                if after is None:
+                    break
+            return True, equipment
+        except Exception as e:
+            return False, str(e)
+    
     def get_dataset_summary(self, dataset_id):
         try:
             r = self.session.get('{}/datasets/{}/summary/'.format(self.base_url, dataset_id))
@@ -289,9 +289,10 @@ class ChartsWidget(QWidget):
                 print("  [Charts] Failed to get summary")
                 return
             
-            success2, detail = self.api.get_dataset_detail(dataset_id)
+            # The line chart plots the first 15 rows
+            success2, equipment = self.api.get_dataset_equipment(dataset_id, max_rows=15)
             if not success2:
-                print("  [Charts] Failed to get detail")
+                print("  [Charts] Failed to get equipment")
                 return
             
             self.empty.hide()
@@ -301,7 +302,6 @@ class ChartsWidget(QWidget):
             dist = summary.get('type_distribution', {})
             avg = summary.get('averages', {})
             ranges = summary.get('ranges', {})
-            equipment = detail.get('equipment', [])
             
             if dist:
                 self.generate_bar_chart(temp_dir, dist, summary.get('total_equipment', 1))
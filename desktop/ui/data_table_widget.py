@@ -517,10 +517,9 @@ class DataTableWidget(QWidget):
         self.search_timer.timeout.connect(self.perform_search)
     
     def load_dataset(self, dataset_id):
-        success, data = self.api.get_dataset_detail(dataset_id)
+        success, equipment = self.api.get_dataset_equipment(dataset_id)
         
         if success:
-            equipment = data.get('equipment', [])
             self.equipment_data = equipment
             self.filtered_data = equipment.copy()
             
@@ -549,9 +548,9 @@ class DataTableWidget(QWidget):
             
             type_item = QTableWidgetItem(eq['equipment_type'])
             
-            flow_item = QTableWidgetItem('{:.2f}'.format(eq['flowrate']))
-            pressure_item = QTableWidgetItem('{:.2f}'.format(eq['pressure']))
-            temp_item = QTableWidgetItem('{:.2f}'.format(eq['temperature']))
+            flow_item = QTableWidgetItem('{:.2f}'.format(eq['flowrate']) if eq['flowrate'] is not None else 'N/A')
+            pressure_item = QTableWidgetItem('{:.2f}'.format(eq['pressure']) if eq['pressure'] is not None else 'N/A')
+            temp_item = QTableWidgetItem('{:.2f}'.format(eq['temperature']) if eq['temperature'] is not None else 'N/A')
             
             flow_item.setTextAlignment(Qt.AlignCenter | Qt.AlignVCenter)
             pressure_item.setTextAlignment(Qt.AlignCenter | Qt.AlignVCenter)
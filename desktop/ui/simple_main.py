@@ -467,13 +467,11 @@ class SimpleMainWindow(QMainWindow):
             QMessageBox.critical(self, "Error", str(result))
     
     def load_table_data(self, dataset_id):
-        success, data = self.api.get_dataset_detail(dataset_id)
+        success, equipment = self.api.get_dataset_equipment(dataset_id)
         
         if not success:
             return
         
-        equipment = data.get('equipment', [])
-        
         if equipment:
             self.table_empty.hide()
             self.table.show()
@@ -482,9 +480,9 @@ class SimpleMainWindow(QMainWindow):
             for row, eq in enumerate(equipment):
                 self.table.setItem(row, 0, QTableWidgetItem(eq['equipment_name']))
                 self.table.setItem(row, 1, QTableWidgetItem(eq['equipment_type']))
-                self.table.setItem(row, 2, QTableWidgetItem('{:.2f}'.format(eq['flowrate'])))
-                self.table.setItem(row, 3, QTableWidgetItem('{:.2f}'.format(eq['pressure'])))
-                self.table.setItem(row, 4, QTableWidgetItem('{:.2f}'.format(eq['temperature'])))
+                self.table.setItem(row, 2, QTableWidgetItem('{:.2f}'.format(eq['flowrate']) if eq['flowrate'] is not None else 'N/A'))
+                self.table.setItem(row, 3, QTableWidgetItem('{:.2f}'.format(eq['pressure']) if eq['pressure'] is not None else 'N/A'))
+                self.table.setItem(row, 4, QTableWidgetItem('{:.2f}'.format(eq['temperature']) if eq['temperature'] is not None else 'N/A'))
     
     def load_charts_data(self, dataset_id):
         if not self.charts_available:
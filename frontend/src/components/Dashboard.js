@@ -20,6 +20,8 @@ import api from '../services/api';
 import Charts from './Charts';
 import DataTable from './DataTable';
 
+const EQUIPMENT_PAGE_SIZE = 1000;
+
 function Dashboard({ user }) {
   const [selectedFile, setSelectedFile] = useState(null);
   const [uploading, setUploading] = useState(false);
@@ -30,6 +32,8 @@ function Dashboard({ user }) {
   const [error, setError] = useState('');
   const [success, setSuccess] = useState('');
   const [dragOver, setDragOver] = useState(false);
+  const [equipmentCursor, setEquipmentCursor] = useState(null);
+  const [loadingEquipment, setLoadingEquipment] = useState(false);
   const fileInputRef = useRef(null);
 
   const handleFileSelect = (e) => {
@@ -75,11 +79,32 @@ function Dashboard({ user }) {
     setSummaryData(null);
     setColumnMapping(null);
     setUploadResponse(null);
+    setEquipmentCursor(null);
     setSelectedFile(null);
     setError('');
     setSuccess('');
   };
 
+  const loadEquipmentPage = async (datasetId, after) => {
+    const response = await api.getDatasetEquipment(datasetId, after, EQUIPMENT_PAGE_SIZE);
+    setEquipmentCursor(response.data.next_cursor);
+    return response.data.results;
+  };
+
+  const handleLoadMoreEquipment = async () => {
+    if (!datasetData || equipmentCursor === null) return;
+
+    setLoadingEquipment(true);
+    try {
+      const more = await loadEquipmentPage(datasetData.id, equipmentCursor);
+      setDatasetData(prev => ({ ...prev, equipment: [...prev.equipment, ...more] }));
+    } catch (err) {
+      setError('Failed to load more equipment');
+    } finally {
+      setLoadingEquipment(false);
+    }
+  };
+
   const handleUpload = async () => {
     if (!selectedFile) {
       setError('Please select a file first');
@@ -92,7 +117,8 @@ function Dashboard({ user }) {
 
     try {
       const response = await api.uploadDataset(selectedFile);
-      setDatasetData(response.data.dataset);
+      const equipment = await loadEquipmentPage(response.data.dataset.id, 0);
+      setDatasetData({ ...response.data.dataset, equipment });
       setColumnMapping(response.data.column_mapping);
       setUploadResponse(response.data);
       
@@ -131,112 +157,58 @@ function Dashboard({ user }) {
   };
 
   const getNumericColumns = () => {
-    if (!datasetData?.equipment || datasetData.equipment.length === 0) return [];
-    
-    const firstEquipment = datasetData.equipment[0];
-    const numericCols = [];
-    
-    Object.keys(firstEquipment).forEach(key => {
-      const value = firstEquipment[key];
-      if (typeof value === 'number' && !isNaN(value) && 
-          key !== 'id' && key !== 'dataset_id' && 
-          !key.includes('name') && !key.includes('type')) {
-        numericCols.push(key);
-      }
-    });
-    
-    return numericCols;
+    return Object.keys(summaryData?.statistics || {});
   };
 
+  // Figures for the whole dataset come from the summary endpoint; the loaded
+  // equipment is only the first page.
   const calculateAverages = () => {
-    if (!datasetData?.equipment || datasetData.equipment.length === 0) return {};
-    
-    const numericColumns = getNumericColumns();
+    const statistics = summaryData?.statistics || {};
     const averages = {};
-    
-    numericColumns.forEach(col => {
-      const values = datasetData.equipment
-        .map(eq => eq[col])
-        .filter(val => val !== null && val !== undefined && !isNaN(val));
-      
-      if (values.length > 0) {
-        const sum = values.reduce((a, b) => a + b, 0);
-        averages[col] = sum / values.length;
+
+    getNumericColumns().forEach(col => {
+      if (statistics[col]) {
+        averages[col] = statistics[col].mean;
       }
     });
-    
+
     return averages;
   };
 
   const calculateRanges = () => {
-    if (!datasetData?.equipment || datasetData.equipment.length === 0) return {};
-    
-    const numericColumns = getNumericColumns();
+    const statistics = summaryData?.statistics || {};
     const ranges = {};
-    
-    numericColumns.forEach(col => {
-      const values = datasetData.equipment
-        .map(eq => eq[col])
-        .filter(val => val !== null && val !== undefined && !isNaN(val));
-      
-      if (values.length > 0) {
+
+    getNumericColumns().forEach(col => {
+      if (statistics[col]) {
         ranges[col] = {
-          min: Math.min(...values),
-          max: Math.max(...values)
+          min: statistics[col].min,
+          max: statistics[col].max
         };
       }
     });
-    
+
     return ranges;
   };
 
   const calculateParameterMetrics = () => {
-    if (!datasetData?.equipment || datasetData.equipment.length === 0) return null;
+    if (!summaryData?.statistics) return null;
 
     const metrics = [];
-    const equipment = datasetData.equipment;
     const numericColumns = getNumericColumns();
 
     if (numericColumns.length === 0) return null;
 
+    // Quartiles are missing after an append until they are recomputed
+    const formatQuartile = (value) => (value === undefined || value === null ? 'N/A' : value.toFixed(2));
+
     numericColumns.forEach(col => {
-      const values = equipment
-        .map(eq => {
-          const val = eq[col];
-          return (val !== null && val !== undefined && !isNaN(val)) ? Number(val) : null;
-        })
-        .filter(v => v !== null)
-        .sort((a, b) => a - b);
-
-      if (values.length === 0) return;
-
-      const sum = values.reduce((a, b) => a + b, 0);
-      const avg = sum / values.length;
-      const min = Math.min(...values);
-      const max = Math.max(...values);
-
-      const variance = values.reduce((acc, val) => acc + Math.pow(val - avg, 2), 0) / values.length;
-      const std = Math.sqrt(variance);
-
-      const getQuartile = (arr, percentile) => {
-        if (arr.length === 0) return 0;
-        const index = (percentile / 100) * (arr.length - 1);
-        const lower = Math.floor(index);
-        const upper = Math.ceil(index);
-        const weight = index % 1;
-        
-        if (lower === upper) return arr[lower];
-        return arr[lower] * (1 - weight) + arr[upper] * weight;
-      };
-
-      const q1 = getQuartile(values, 25);
-      const median = getQuartile(values, 50);
-      const q3 = getQuartile(values, 75);
-      const iqr = q3 - q1;
-
-      const lowerBound = q1 - (1.5 * iqr);
-      const upperBound = q3 + (1.5 * iqr);
-      const outliers = values.filter(v => v < lowerBound || v > upperBound).length;
+      const stats = summaryData.statistics[col];
+      if (!stats) return;
+
+      const { mean: avg, min, max, std } = stats;
+      const hasQuartiles = stats.q1 !== undefined && stats.q1 !== null;
+      const outliers = hasQuartiles && (min < stats.whisker_low || max > stats.whisker_high);
 
       const dataRange = max - min;
       const relativeSpread = avg !== 0 ? dataRange / Math.abs(avg) : 0;
@@ -248,14 +220,14 @@ function Dashboard({ user }) {
         min: min.toFixed(2),
         max: max.toFixed(2),
         std: std.toFixed(2),
-        median: median.toFixed(2),
-        q1: q1.toFixed(2),
-        q3: q3.toFixed(2),
-        iqr: iqr.toFixed(2),
+        median: formatQuartile(stats.median),
+        q1: formatQuartile(stats.q1),
+        q3: formatQuartile(stats.q3),
+        iqr: formatQuartile(stats.iqr),
         outliers: outliers,
-        dataPoints: values.length,
+        dataPoints: stats.count,
         efficiency: efficiency,
-        status: outliers === 0 ? 'stable' : outliers <= 2 ? 'moderate' : 'unstable'
+        status: outliers ? 'unstable' : 'stable'
       });
     });
 
@@ -396,7 +368,7 @@ function Dashboard({ user }) {
                     </div>
                     <div className="stat-label">Avg {colName}</div>
                     <div className="stat-value">
-                      {avg ? avg.toFixed(2) : 'N/A'}
+                      {avg !== undefined && avg !== null ? avg.toFixed(2) : 'N/A'}
                     </div>
                     {range && (
                       <div className="stat-range">
@@ -409,7 +381,13 @@ function Dashboard({ user }) {
             }
           </div>
 
-          <DataTable equipment={datasetData.equipment || []} />
+          <DataTable
+            equipment={datasetData.equipment || []}
+            total={datasetData.total_equipment}
+            hasMore={equipmentCursor !== null}
+            loadingMore={loadingEquipment}
+            onLoadMore={handleLoadMoreEquipment}
+          />
 
           <Charts dataset={datasetData} summary={summaryData} />
 
@@ -551,10 +529,10 @@ function Dashboard({ user }) {
                               <span className="info-label">Data Points:</span>
                               <span className="info-value">{metric.dataPoints}</span>
                             </div>
-                            {metric.outliers > 0 && (
+                            {metric.outliers && (
                               <div className="metric-info-item warning">
                                 <span className="info-label">⚠ Outliers:</span>
-                                <span className="info-value">{metric.outliers}</span>
+                                <span className="info-value">beyond 1.5 × IQR</span>
                               </div>
                             )}
                           </div>
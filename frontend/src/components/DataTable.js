@@ -1,7 +1,10 @@
 import React, { useState } from 'react';
 import { FaSearch, FaSort, FaSortUp, FaSortDown } from 'react-icons/fa';
 
-function DataTable({ equipment }) {
+// Readings left blank in the upload are stored as null
+const formatReading = (value) => (value === null ? 'N/A' : value.toFixed(2));
+
+function DataTable({ equipment, total, hasMore, loadingMore, onLoadMore }) {
   const [sortField, setSortField] = useState(null);
   const [sortDirection, setSortDirection] = useState('asc');
   const [searchTerm, setSearchTerm] = useState('');
@@ -79,6 +82,7 @@ function DataTable({ equipment }) {
         </div>
         <span className="table-info">
           Showing {startIndex + 1} to {Math.min(startIndex + itemsPerPage, filteredData.length)} of {filteredData.length} entries
+          {hasMore && total ? ` (${equipment.length} of ${total} loaded)` : ''}
         </span>
       </div>
 
@@ -110,9 +114,9 @@ function DataTable({ equipment }) {
                 <td>
                   <span className="type-badge">{item.equipment_type}</span>
                 </td>
-                <td className="numeric">{item.flowrate.toFixed(2)}</td>
-                <td className="numeric">{item.pressure.toFixed(2)}</td>
-                <td className="numeric">{item.temperature.toFixed(2)}</td>
+                <td className="numeric">{formatReading(item.flowrate)}</td>
+                <td className="numeric">{formatReading(item.pressure)}</td>
+                <td className="numeric">{formatReading(item.temperature)}</td>
               </tr>
             ))}
           </tbody>
@@ -142,6 +146,14 @@ function DataTable({ equipment }) {
           </button>
         </div>
       )}
+
+      {hasMore && (
+        <div className="pagination">
+          <button onClick={onLoadMore} disabled={loadingMore} className="pagination-btn">
+            {loadingMore ? 'Loading...' : 'Load more rows'}
+          </button>
+        </div>
+      )}
     </div>
   );
 }
@@ -103,6 +103,10 @@ const api = {
     return apiClient.get(`/datasets/${id}/`);
   },
 
+  getDatasetEquipment: (id, after = 0, limit) => {
+    return apiClient.get(`/datasets/${id}/equipment/`, { params: { after, limit } });
+  },
+
   getDatasetSummary: (id) => {
     return apiClient.get(`/datasets/${id}/summary/`);
   },